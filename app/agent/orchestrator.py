@@ -1,18 +1,188 @@
 """LangChain-based agent orchestrator for conversation management."""
 
+import asyncio
 import logging
-from typing import Optional, Dict, Any, List
+import re
+from contextlib import aclosing
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, AsyncIterator, Callable
+import httpx
+from cachetools import TTLCache
 from langchain_openai import ChatOpenAI
 from langchain.agents import AgentExecutor, create_openai_functions_agent
-from langchain.memory import ConversationBufferMemory
+from langchain.memory import ConversationSummaryBufferMemory
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 
 from app.config import settings
-from app.agent.prompts import BFSIPrompts, NOTIFICATION_PROMPT, MARKETING_PROMPT
-from app.agent.tools import get_tools_for_persona
+from app.agent.prompts import (
+    PROMPT_CACHE,
+    NOTIFICATION_SYSTEM_PROMPT,
+    NOTIFICATION_MESSAGE_TEMPLATE,
+    MARKETING_SYSTEM_PROMPT,
+    MARKETING_CONTEXT_TEMPLATE,
+)
+from app.agent.tools import get_tools_for_persona, match_intent
 
 logger = logging.getLogger(__name__)
 
+# Stop sequences so chat replies end before paragraphs, URLs or bullet
+# lists that would be trimmed for voice anyway. Chat only: marketing keeps
+# URLs and notifications must not be cut short.
+_STOP_SEQUENCES = ["\n\n", "http", "•"]
+
+# Voice post-processing: bullet markers (and optionally URLs, which tool
+# output can still contain) in one regex pass, markdown emphasis via a
+# translate table, sentence boundaries for trimming
+_POST_RE = re.compile(r'^-\s|•\s', re.MULTILINE)
+_POST_URL_RE = re.compile(r'https?://\S+|^-\s|•\s', re.MULTILINE)
+_MARKDOWN_TABLE = str.maketrans("", "", "*")
+_SENT_RE = re.compile(r'(?<=[.!?])\s+')
+_COMPLETE_RE = re.compile(r'.*[.!?](?=\s|$)', re.DOTALL)  # Up to the last sentence end
+_MAX_SENTENCES = 3
+
+
+def make_postprocess(
+    strip_urls: bool = True,
+    max_sentences: Optional[int] = _MAX_SENTENCES,
+    complete_sentences: bool = False
+) -> Callable[[str], str]:
+    """Build a voice post-processor containing only the needed steps.
+    
+    Options are resolved once here rather than checked on every response.
+    
+    Args:
+        strip_urls: Remove URLs from the response
+        max_sentences: Keep at most this many sentences (None = no cap)
+        complete_sentences: With no cap, drop any trailing fragment a
+            token limit cut off (empty if no sentence was completed)
+        
+    Returns:
+        Function mapping a raw response to voice-ready text
+    """
+    strip_sub = (_POST_URL_RE if strip_urls else _POST_RE).sub
+    finditer = _SENT_RE.finditer
+    
+    if max_sentences is None and complete_sentences:
+        match_complete = _COMPLETE_RE.match
+        
+        def postprocess_complete(response: str) -> str:
+            match = match_complete(strip_sub("", response).translate(_MARKDOWN_TABLE).strip())
+            return match.group(0) if match else ""
+        
+        return postprocess_complete
+    
+    if max_sentences is None:
+        def postprocess(response: str) -> str:
+            return strip_sub("", response).translate(_MARKDOWN_TABLE).strip()
+        
+        return postprocess
+    
+    def postprocess_capped(response: str) -> str:
+        response = strip_sub("", response).translate(_MARKDOWN_TABLE)
+        
+        # Slice at the last kept sentence boundary
+        for count, boundary in enumerate(finditer(response), start=1):
+            if count == max_sentences:
+                return response[:boundary.start()].strip()
+        
+        return response.strip()
+    
+    return postprocess_capped
+
+
+# Specialized post-processors per call type
+_postprocess_chat = make_postprocess(strip_urls=True, max_sentences=_MAX_SENTENCES)
+_postprocess_notification = make_postprocess(strip_urls=True, max_sentences=None, complete_sentences=True)
+_postprocess_marketing = make_postprocess(strip_urls=False, max_sentences=_MAX_SENTENCES)
+
+# Shared OpenAI HTTP client: HTTP/2 multiplexing and keep-alive across all
+# agents, so concurrent turns reuse connections instead of new TLS handshakes
+openai_http_client = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+    timeout=httpx.Timeout(30.0, connect=5.0),
+)
+
+# Session memory bounds: abandoned calls are evicted after the TTL
+_MEMORY_MAX_SESSIONS = 2048
+_MEMORY_TTL_SECONDS = 1800
+_MEMORY_EXPIRE_INTERVAL = 60
+
+# Completion caps per reply type, so short notification ACKs and long
+# marketing pitches each get a size that fits
+_REPLY_MAX_TOKENS = {
+    "notification": 60,
+    "conversation": 120,
+    "marketing": 180,
+}
+
+# Older turns beyond this many tokens are folded into a running summary,
+# keeping the prompt size flat over long calls
+_MEMORY_MAX_TOKENS = 400
+
+# Completion cap for that running summary (the reply LLM's voice-sized cap
+# would cut it short and silently drop older turns)
+_SUMMARY_MAX_TOKENS = 256
+
+
+@lru_cache(maxsize=8)
+def _build_agent(persona: str, model: str, temperature: float, max_tokens: int) -> tuple:
+    """Build LLM, tools, prompt and functions agent for a configuration.
+    
+    Memoized so tool schemas and the agent runnable are derived once per
+    (persona, model, temperature, max_tokens).
+    
+    Args:
+        persona: Agent persona
+        model: OpenAI model name
+        temperature: Response randomness (0-1)
+        max_tokens: Maximum response length
+        
+    Returns:
+        Tuple of (llm, tools, prompt, agent)
+    """
+    llm = ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        openai_api_key=settings.OPENAI_API_KEY,
+        http_async_client=openai_http_client,
+    )
+    
+    # Get tools for persona
+    tools = get_tools_for_persona(persona)
+    
+    # Prompt template (precompiled at import, unknown personas fall back to bank)
+    prompt = PROMPT_CACHE.get(persona, PROMPT_CACHE["bank"])
+    
+    # Create agent (voice stop sequences apply to chat turns only)
+    agent = create_openai_functions_agent(
+        llm=llm.bind(stop=_STOP_SEQUENCES),
+        tools=tools,
+        prompt=prompt
+    )
+    
+    return llm, tools, prompt, agent
+
+
+@lru_cache(maxsize=4)
+def _build_summary_llm(model: str) -> ChatOpenAI:
+    """Build the LLM that folds older turns into the memory summary.
+    
+    Args:
+        model: OpenAI model name
+        
+    Returns:
+        ChatOpenAI without stop sequences and with a summary-sized cap
+    """
+    return ChatOpenAI(
+        model=model,
+        temperature=0,
+        max_tokens=_SUMMARY_MAX_TOKENS,
+        openai_api_key=settings.OPENAI_API_KEY,
+        http_async_client=openai_http_client,
+    )
+
 
 class VoiceAgentOrchestrator:
     """LangChain-based orchestrator for voice agent conversations.
@@ -41,50 +211,83 @@ class VoiceAgentOrchestrator:
         self.temperature = temperature
         self.max_tokens = max_tokens
         
-        # Initialize LLM
-        self.llm = ChatOpenAI(
-            model=self.model,
-            temperature=self.temperature,
-            max_tokens=self.max_tokens,
-            openai_api_key=settings.OPENAI_API_KEY,
+        # LLM, tools, prompt and agent are memoized per configuration
+        self.llm, self.tools, self.prompt, self.agent = _build_agent(
+            persona, self.model, self.temperature, self.max_tokens
         )
         
-        # Get tools for persona
-        self.tools = get_tools_for_persona(persona)
+        # Memory summaries use their own LLM, free of the reply constraints
+        self._summary_llm = _build_summary_llm(self.model)
         
-        # Create prompt template
-        self.prompt = BFSIPrompts.create_chat_prompt(persona)
+        # Per-reply-type LLMs so each caps its own completion size
+        self._reply_llms = {
+            reply_type: self.llm.bind(max_tokens=reply_tokens)
+            for reply_type, reply_tokens in _REPLY_MAX_TOKENS.items()
+        }
+        # Streamed chat replies stop where the executor's do
+        self._reply_llms["conversation"] = self._reply_llms["conversation"].bind(stop=_STOP_SEQUENCES)
         
-        # Create agent
-        self.agent = create_openai_functions_agent(
-            llm=self.llm,
+        # Shared executor; session memory is loaded and saved per turn.
+        # verbose tracing prints to stdout synchronously, so only in debug.
+        self._executor = AgentExecutor(
+            agent=self.agent,
             tools=self.tools,
-            prompt=self.prompt
+            verbose=settings.DEBUG,
+            max_iterations=3,  # Limit iterations for voice
+            handle_parsing_errors=True,
         )
         
-        # Session-based memory storage
-        self._memories: Dict[str, ConversationBufferMemory] = {}
+        # Session-based memory storage (bounded LRU with TTL eviction)
+        self._memories: TTLCache = TTLCache(
+            maxsize=_MEMORY_MAX_SESSIONS,
+            ttl=_MEMORY_TTL_SECONDS
+        )
+        self._expire_task: Optional[asyncio.Task] = None
         
         logger.info(f"Agent orchestrator initialized: persona={persona}, model={self.model}")
     
-    def _get_or_create_memory(self, session_id: str) -> ConversationBufferMemory:
+    def _get_or_create_memory(self, session_id: str) -> ConversationSummaryBufferMemory:
         """Get or create conversation memory for session.
         
         Args:
             session_id: Call session ID
             
         Returns:
-            ConversationBufferMemory for this session
+            ConversationSummaryBufferMemory for this session
         """
-        if session_id not in self._memories:
-            self._memories[session_id] = ConversationBufferMemory(
+        self._ensure_expiry_task()
+        
+        try:
+            return self._memories[session_id]
+        except KeyError:
+            memory = ConversationSummaryBufferMemory(
+                llm=self._summary_llm,
+                max_token_limit=_MEMORY_MAX_TOKENS,
                 memory_key="chat_history",
                 return_messages=True,
                 output_key="output"
             )
+            self._memories[session_id] = memory
             logger.info(f"Created new memory for session: {session_id}")
+            return memory
+    
+    def _ensure_expiry_task(self):
+        """Start the periodic memory expiry task if an event loop is running."""
+        if self._expire_task is not None and not self._expire_task.done():
+            return
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop (sync usage) - TTLCache still expires lazily on access
         
-        return self._memories[session_id]
+        self._expire_task = loop.create_task(self._expire_memories())
+    
+    async def _expire_memories(self):
+        """Periodically drop expired session memories."""
+        while True:
+            await asyncio.sleep(_MEMORY_EXPIRE_INTERVAL)
+            self._memories.expire()
     
     def clear_session_memory(self, session_id: str):
         """Clear memory for a session.
@@ -92,8 +295,7 @@ class VoiceAgentOrchestrator:
         Args:
             session_id: Call session ID
         """
-        if session_id in self._memories:
-            del self._memories[session_id]
+        if self._memories.pop(session_id, None) is not None:
             logger.info(f"Cleared memory for session: {session_id}")
     
     async def process_user_input(
@@ -118,23 +320,28 @@ class VoiceAgentOrchestrator:
             # Get memory for this session
             memory = self._get_or_create_memory(session_id)
             
-            # Create agent executor with memory
-            agent_executor = AgentExecutor(
-                agent=self.agent,
-                tools=self.tools,
-                memory=memory,
-                verbose=True,
-                max_iterations=3,  # Limit iterations for voice
-                handle_parsing_errors=True,
-            )
+            # Obvious queries (hours, branch lookup, product info) skip the LLM
+            direct_response = match_intent(user_input)
+            if direct_response is not None:
+                response = self._post_process_response(direct_response)
+                await memory.asave_context({"input": user_input}, {"output": response})
+                logger.info(f"Agent response (direct): '{response}'")
+                return response
+            
+            history = (await memory.aload_memory_variables({}))["chat_history"]
             
             # Execute agent
-            result = await agent_executor.ainvoke({"input": user_input})
+            result = await self._executor.ainvoke({"input": user_input, "chat_history": history})
             
-            response = result.get("output", "I apologize, I didn't understand that. Could you please rephrase?")
+            output = result.get("output", "I apologize, I didn't understand that. Could you please rephrase?")
             
             # Post-process response for voice
-            response = self._post_process_response(response)
+            response = self._post_process_response(output)
+            if not response:
+                # A stop sequence can end the reply before any text (leading bullet)
+                raise ValueError("Agent returned an empty response")
+            
+            await memory.asave_context({"input": user_input}, {"output": output})
             
             logger.info(f"Agent response: '{response}'")
             
@@ -153,23 +360,105 @@ class VoiceAgentOrchestrator:
         Returns:
             Processed response suitable for voice
         """
-        # Remove markdown formatting
-        response = response.replace("**", "").replace("*", "")
+        return _postprocess_chat(response)
+    
+    async def process_user_input_stream(
+        self,
+        user_input: str,
+        session_id: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Process user input and stream the response sentence by sentence.
         
-        # Remove bullet points
-        response = response.replace("- ", "").replace("• ", "")
+        Lets the caller start TTS on the first sentence while the rest is
+        still being generated. Streams a plain LLM reply (no tool calling);
+        deterministic intents are still answered directly.
         
-        # Limit length (split into sentences, take first 2-3)
-        sentences = response.split(". ")
-        if len(sentences) > 3:
-            response = ". ".join(sentences[:3]) + "."
+        Not used by the gather webhook yet: it returns one XML document,
+        built after the full reply (with tool calling) is ready. This is
+        for a streamed-audio call path.
         
-        # Remove URLs (not useful in voice)
-        # Simple removal - can be enhanced
-        if "http" in response.lower():
-            response = response.split("http")[0].strip()
+        Args:
+            user_input: User's speech input
+            session_id: Call session ID
+            context: Additional context (call type, metadata, etc.)
+            
+        Yields:
+            Voice-ready sentences, at most three
+        """
+        spoken: List[str] = []
         
-        return response.strip()
+        try:
+            logger.info(f"Streaming input for session {session_id}: '{user_input}'")
+            
+            memory = self._get_or_create_memory(session_id)
+            
+            direct_response = match_intent(user_input)
+            if direct_response is not None:
+                response = self._post_process_response(direct_response)
+                spoken.append(response)
+                yield response
+                await memory.asave_context({"input": user_input}, {"output": response})
+                return
+            
+            history = (await memory.aload_memory_variables({}))["chat_history"]
+            messages = await self.prompt.aformat_messages(
+                input=user_input,
+                chat_history=history,
+                agent_scratchpad=[]
+            )
+            
+            llm = self._reply_llms["conversation"]
+            buffer = ""
+            
+            async with aclosing(llm.astream(messages)) as stream:
+                async for chunk in stream:
+                    buffer += chunk.content
+                    
+                    # Emit every complete sentence in the buffer
+                    while len(spoken) < _MAX_SENTENCES:
+                        boundary = _SENT_RE.search(buffer)
+                        if not boundary:
+                            break
+                        sentence = self._strip_markdown(buffer[:boundary.start()])
+                        buffer = buffer[boundary.end():]
+                        if sentence:
+                            spoken.append(sentence)
+                            yield sentence
+                    
+                    if len(spoken) >= _MAX_SENTENCES:
+                        break
+            
+            # Flush the trailing sentence (no whitespace after final punctuation)
+            if len(spoken) < _MAX_SENTENCES:
+                sentence = self._strip_markdown(buffer)
+                if sentence:
+                    spoken.append(sentence)
+                    yield sentence
+            
+            if not spoken:
+                raise ValueError("Agent returned an empty response")
+            
+            await memory.asave_context({"input": user_input}, {"output": " ".join(spoken)})
+            
+            logger.info(f"Agent streamed response: '{' '.join(spoken)}'")
+            
+        except Exception as e:
+            logger.error(f"Error streaming user input: {str(e)}", exc_info=True)
+            if not spoken:
+                yield "I apologize, I'm having trouble processing that. Could you please try again?"
+    
+    @staticmethod
+    def _strip_markdown(text: str) -> str:
+        """Strip bullets and markdown emphasis from a response fragment.
+        
+        Args:
+            text: Response fragment
+            
+        Returns:
+            Cleaned fragment
+        """
+        return _POST_RE.sub("", text).translate(_MARKDOWN_TABLE).strip()
     
     async def generate_notification_response(
         self,
@@ -186,14 +475,17 @@ class VoiceAgentOrchestrator:
             Agent response
         """
         try:
-            prompt = NOTIFICATION_PROMPT.format(message=message)
+            messages = [
+                SystemMessage(content=NOTIFICATION_SYSTEM_PROMPT),
+                HumanMessage(content=NOTIFICATION_MESSAGE_TEMPLATE.format(message=message))
+            ]
             
-            response = await self.llm.ainvoke([
-                SystemMessage(content=prompt),
-                HumanMessage(content="Please deliver the notification.")
-            ])
+            response = await self._reply_llms["notification"].ainvoke(messages)
             
-            return self._post_process_response(response.content)
+            text = _postprocess_notification(response.content)
+            if not text:
+                raise ValueError("Empty notification response")
+            return text
             
         except Exception as e:
             logger.error(f"Error generating notification response: {str(e)}")
@@ -220,46 +512,61 @@ class VoiceAgentOrchestrator:
             Agent response
         """
         try:
-            prompt = MARKETING_PROMPT.format(
+            context = MARKETING_CONTEXT_TEMPLATE.format(
                 campaign_name=campaign_name,
                 objective=objective,
                 segment=segment
             )
             
-            messages = [SystemMessage(content=prompt)]
+            messages = [
+                SystemMessage(content=MARKETING_SYSTEM_PROMPT),
+                HumanMessage(content=context)
+            ]
             
             if user_input:
                 messages.append(HumanMessage(content=user_input))
             else:
                 messages.append(HumanMessage(content="Start the marketing call."))
             
-            response = await self.llm.ainvoke(messages)
+            response = await self._reply_llms["marketing"].ainvoke(messages)
             
-            return self._post_process_response(response.content)
+            text = _postprocess_marketing(response.content)
+            if not text:
+                raise ValueError("Empty marketing response")
+            return text
             
         except Exception as e:
             logger.error(f"Error generating marketing response: {str(e)}")
             return f"Hello! I'm calling about {campaign_name}. Would you be interested in learning more?"
 
 
+async def close_http_client():
+    """Close the shared OpenAI HTTP client (call on application shutdown)."""
+    await openai_http_client.aclose()
+
+
 # Global agent instances for different personas
 # These are stateless - memory is per-session
-_agents: Dict[str, VoiceAgentOrchestrator] = {}
+@lru_cache(maxsize=8)
+def _cached_get_agent(persona: str) -> VoiceAgentOrchestrator:
+    """Create the agent for a persona once (always called positionally)."""
+    return VoiceAgentOrchestrator(persona=persona)
 
 
 def get_agent(persona: str = "bank") -> VoiceAgentOrchestrator:
     """Get or create agent for persona.
     
+    lru_cache keys calls by how arguments are passed, so get_agent(),
+    get_agent("bank") and get_agent(persona="bank") would each build their
+    own orchestrator; normalizing to a positional call keeps one per persona.
+    
     Args:
         persona: Agent persona
         
     Returns:
         VoiceAgentOrchestrator instance
     """
-    if persona not in _agents:
-        _agents[persona] = VoiceAgentOrchestrator(persona=persona)
-    
-    return _agents[persona]
+    return _cached_get_agent(persona)
 
 
 # Convenience function for telephony handlers
@@ -282,3 +589,27 @@ async def process_call_input(
     """
     agent = get_agent(persona)
     return await agent.process_user_input(user_input, session_id, context)
+
+
+async def stream_call_input(
+    user_input: str,
+    session_id: str,
+    persona: str = "bank",
+    context: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[str]:
+    """Stream the agent response to user input sentence by sentence.
+    
+    Not yet called by the telephony handlers, which use process_call_input.
+    
+    Args:
+        user_input: User's speech
+        session_id: Call session ID
+        persona: Agent persona
+        context: Additional context
+        
+    Yields:
+        Voice-ready sentences
+    """
+    agent = get_agent(persona)
+    async for sentence in agent.process_user_input_stream(user_input, session_id, context):
+        yield sentence
@@ -1,6 +1,7 @@
 """Prompt templates for different call types and BFSI scenarios."""
 
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Mapping
 from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 
 
@@ -89,12 +90,7 @@ SAMPLE RESPONSES:
         Returns:
             System prompt string
         """
-        prompts = {
-            "bank": cls.BANK_SYSTEM_PROMPT,
-            "insurance": cls.INSURANCE_SYSTEM_PROMPT,
-            "financial_services": cls.FINANCIAL_SERVICES_SYSTEM_PROMPT,
-        }
-        return prompts.get(persona, cls.BANK_SYSTEM_PROMPT)
+        return SYSTEM_PROMPT_CACHE.get(persona, cls.BANK_SYSTEM_PROMPT)
     
     @classmethod
     def create_chat_prompt(cls, persona: str = "bank") -> ChatPromptTemplate:
@@ -116,10 +112,27 @@ SAMPLE RESPONSES:
         ])
 
 
+# Precomputed per-persona prompts, built once at import and shared
+# across all orchestrator instances
+PERSONAS = ("bank", "insurance", "financial_services")
+
+SYSTEM_PROMPT_CACHE: Mapping[str, str] = MappingProxyType({
+    "bank": BFSIPrompts.BANK_SYSTEM_PROMPT,
+    "insurance": BFSIPrompts.INSURANCE_SYSTEM_PROMPT,
+    "financial_services": BFSIPrompts.FINANCIAL_SERVICES_SYSTEM_PROMPT,
+})
+
+PROMPT_CACHE: Mapping[str, ChatPromptTemplate] = MappingProxyType({
+    persona: BFSIPrompts.create_chat_prompt(persona) for persona in PERSONAS
+})
+
+
 # Notification call prompts
-NOTIFICATION_PROMPT = """You are delivering a notification message to a customer.
+# Instructions stay static so the system prefix is reusable across calls
+# (OpenAI prompt caching); per-call data goes in a separate user message.
+NOTIFICATION_SYSTEM_PROMPT = """You are delivering a notification message to a customer.
 
-MESSAGE TO DELIVER: {message}
+The message to deliver is provided in the next message.
 
 Deliver this message clearly and professionally. After delivery:
 1. Confirm the customer heard the message
@@ -128,12 +141,15 @@ Deliver this message clearly and professionally. After delivery:
 
 Keep it brief and professional."""
 
+NOTIFICATION_MESSAGE_TEMPLATE = """MESSAGE TO DELIVER: {message}
+
+Please deliver the notification."""
+
 
 # Marketing call prompts
-MARKETING_PROMPT = """You are making a marketing call for: {campaign_name}
+MARKETING_SYSTEM_PROMPT = """You are making a marketing call for a campaign.
 
-CAMPAIGN OBJECTIVE: {objective}
-TARGET SEGMENT: {segment}
+The campaign name, objective and target segment are provided in the next message.
 
 GUIDELINES:
 - Introduce yourself and the purpose clearly
@@ -144,3 +160,7 @@ GUIDELINES:
 - Thank them for their time regardless of response
 
 Keep it conversational and respectful."""
+
+MARKETING_CONTEXT_TEMPLATE = """CAMPAIGN: {campaign_name}
+CAMPAIGN OBJECTIVE: {objective}
+TARGET SEGMENT: {segment}"""
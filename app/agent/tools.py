@@ -1,11 +1,42 @@
 """LangChain tools for agent capabilities."""
 
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional, Dict, Any
 from langchain.tools import tool
 import logging
+import re
 
 logger = logging.getLogger(__name__)
 
+# Static tool data, built once at import
+_SERVICE_HOURS = "Our customer service is available 24/7. Branch hours are Monday to Friday 10 AM to 4 PM, and Saturday 10 AM to 2 PM."
+
+# TODO: Integrate with product catalog
+_PRODUCT_INFO = MappingProxyType({
+    "savings account": "We offer various savings accounts with competitive interest rates and zero balance options. Would you like to know about specific account types?",
+    "credit card": "We have credit cards for different needs - cashback, rewards, travel, and fuel. Interest rates start from 3.5% per month. Which category interests you?",
+    "personal loan": "Personal loans are available from 10.5% per annum with flexible tenures. Eligibility depends on income and credit score. Would you like to check eligibility?",
+    "home loan": "Home loans available at competitive rates starting from 8.5% per annum. We offer up to 90% financing. Shall I connect you to our home loan specialist?",
+    "insurance": "We offer term insurance, health insurance, and investment-linked plans. Which type would you like to know about?",
+})
+
+
+@lru_cache(maxsize=64)
+def _lookup_product(product_type: str) -> str:
+    """Look up product information by product type.
+    
+    Args:
+        product_type: Product type as given by the caller
+        
+    Returns:
+        Product information
+    """
+    return _PRODUCT_INFO.get(
+        product_type.lower().strip(),
+        f"I can provide general information about {product_type}. For detailed features and pricing, I recommend speaking with our specialist. Would you like me to connect you?"
+    )
+
 
 @tool
 def get_branch_locations(city: str) -> str:
@@ -33,7 +64,7 @@ def check_service_hours() -> str:
     """
     logger.info("Service hours requested")
     
-    return "Our customer service is available 24/7. Branch hours are Monday to Friday 10 AM to 4 PM, and Saturday 10 AM to 2 PM."
+    return _SERVICE_HOURS
 
 
 @tool
@@ -48,19 +79,7 @@ def get_product_information(product_type: str) -> str:
     """
     logger.info(f"Product info requested: {product_type}")
     
-    # TODO: Integrate with product catalog
-    product_info = {
-        "savings account": "We offer various savings accounts with competitive interest rates and zero balance options. Would you like to know about specific account types?",
-        "credit card": "We have credit cards for different needs - cashback, rewards, travel, and fuel. Interest rates start from 3.5% per month. Which category interests you?",
-        "personal loan": "Personal loans are available from 10.5% per annum with flexible tenures. Eligibility depends on income and credit score. Would you like to check eligibility?",
-        "home loan": "Home loans available at competitive rates starting from 8.5% per annum. We offer up to 90% financing. Shall I connect you to our home loan specialist?",
-        "insurance": "We offer term insurance, health insurance, and investment-linked plans. Which type would you like to know about?",
-    }
-    
-    return product_info.get(
-        product_type.lower(),
-        f"I can provide general information about {product_type}. For detailed features and pricing, I recommend speaking with our specialist. Would you like me to connect you?"
-    )
+    return _lookup_product(product_type)
 
 
 @tool
@@ -97,24 +116,91 @@ def schedule_callback(preferred_time: str, topic: str) -> str:
     return f"I've scheduled a callback for {preferred_time} regarding {topic}. Our team will reach out to you. Is there anything else I can help with?"
 
 
-# Tool list for agent
-BFSI_TOOLS = [
+# Tool list for agent (immutable - shared by every agent)
+BFSI_TOOLS = (
     get_branch_locations,
     check_service_hours,
     get_product_information,
     transfer_to_department,
     schedule_callback,
-]
+)
+
+
+# Deterministic intents answered without an LLM round-trip. Patterns are
+# anchored to the whole utterance and deliberately narrow - anything with
+# extra content ("my card was stolen, when are you open?") falls through
+# to the agent. Each entry: (pattern, tool, builder of tool input)
+_INTENT_LEAD = r"^\s*(?:(?:hi|hello|okay|ok|please)[,\s]+)?(?:(?:can|could)\s+you\s+tell\s+me\s+)?"
+_INTENT_TAIL = r"(?:[,\s]+please)?\s*[?.!]*\s*$"
+
+# Words after "branch in/near" that are not a city ("near me", "near here")
+_NOT_A_CITY = r"(?:me|my|mine|here|there|you|your|us|our|home|this|that|it)\b"
+
+INTENT_PATTERNS = (
+    (
+        re.compile(
+            _INTENT_LEAD
+            + r"(?:what\s+(?:are|is)\s+(?:your|the)\s+"
+            r"(?:service\s+|branch\s+|working\s+|opening\s+|business\s+)?(?:hours|timings?)"
+            r"|when\s+(?:are\s+you|is\s+(?:the|your)\s+branch)\s+open)(?:\s+today)?"
+            + _INTENT_TAIL,
+            re.IGNORECASE
+        ),
+        check_service_hours,
+        lambda match: {},
+    ),
+    (
+        re.compile(
+            _INTENT_LEAD
+            + r"(?:(?:is|are)\s+there\s+(?:a\s+|any\s+)?|where\s+(?:is|are)\s+(?:your|the)\s+)?"
+            # Single city token only - multi-word places go to the agent
+            r"branch(?:es)?\s+(?:in|near)\s+(?!" + _NOT_A_CITY + r")([a-z]{2,30})"
+            + _INTENT_TAIL,
+            re.IGNORECASE
+        ),
+        get_branch_locations,
+        lambda match: {"city": match.group(1).title()},
+    ),
+    (
+        re.compile(
+            _INTENT_LEAD
+            + r"(?:tell\s+me\s+about|information\s+(?:on|about)|details\s+(?:of|on|about))\s+"
+            r"(?:your\s+|a\s+|the\s+)?(savings\s+account|credit\s+card|personal\s+loan|home\s+loan)s?"
+            + _INTENT_TAIL,
+            re.IGNORECASE
+        ),
+        get_product_information,
+        lambda match: {"product_type": " ".join(match.group(1).lower().split())},
+    ),
+)
+
+
+def match_intent(text: str) -> Optional[str]:
+    """Answer an utterance directly if it matches a deterministic intent.
+    
+    Args:
+        text: User's speech input
+        
+    Returns:
+        Tool output if an intent matched, None otherwise
+    """
+    for pattern, intent_tool, build_input in INTENT_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            logger.info(f"Intent matched: {intent_tool.name}")
+            return intent_tool.invoke(build_input(match))
+    
+    return None
 
 
-def get_tools_for_persona(persona: str) -> list:
+def get_tools_for_persona(persona: str) -> tuple:
     """Get appropriate tools for agent persona.
     
     Args:
         persona: Agent persona (bank, insurance, financial_services)
         
     Returns:
-        List of tools
+        Tuple of tools
     """
     # All personas get base tools
     # Can be extended with persona-specific tools
@@ -1,16 +1,45 @@
 """API endpoints for data analytics and reporting."""
 
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import Optional
 from datetime import date
 import logging
+import re
+import threading
 
-from app.storage.csv_storage import csv_storage
-from app.storage.metrics_storage import metrics_storage
+from cachetools import TTLCache
 
-router = APIRouter()
+from app.storage.csv_storage import get_csv_storage
+from app.storage.metrics_storage import get_metrics_storage
+
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 
+# Short-lived stats cache so polling dashboards share one CSV scan per window.
+# Keyed by campaign_id (None = all campaigns); cleared whenever a row is written.
+# The generation counter lets a scan that raced a write skip storing its result.
+_STATS_TTL_SECONDS = 10
+_stats_cache: TTLCache = TTLCache(maxsize=64, ttl=_STATS_TTL_SECONDS)
+_stats_lock = threading.Lock()
+_stats_generation = 0
+
+
+def _invalidate_marketing_stats(data) -> None:
+    """Drop cached stats after a marketing row is saved.
+    
+    Args:
+        data: Saved MarketingCallData
+    """
+    global _stats_generation
+    with _stats_lock:
+        _stats_generation += 1
+        _stats_cache.pop(data.campaign_id or None, None)
+        _stats_cache.pop(None, None)
+
+
+get_csv_storage().add_marketing_listener(_invalidate_marketing_stats)
+
 
 @router.get("/marketing/stats")
 async def get_marketing_stats(campaign_id: Optional[str] = Query(None)):
@@ -22,8 +51,21 @@ async def get_marketing_stats(campaign_id: Optional[str] = Query(None)):
     Returns:
         Statistics dictionary
     """
+    # Storage treats an empty filter as "all campaigns"; cache it the same way
+    campaign_id = campaign_id or None
+    
     try:
-        stats = csv_storage.get_marketing_stats(campaign_id)
+        with _stats_lock:
+            stats = _stats_cache.get(campaign_id)
+            generation = _stats_generation
+        
+        if stats is None:
+            stats = get_csv_storage().get_marketing_stats(campaign_id)
+            if "error" not in stats:
+                with _stats_lock:
+                    if _stats_generation == generation:
+                        _stats_cache[campaign_id] = stats
+        
         return stats
     except Exception as e:
         logger.error(f"Error getting marketing stats: {str(e)}")
@@ -32,20 +74,23 @@ async def get_marketing_stats(campaign_id: Optional[str] = Query(None)):
 
 @router.get("/marketing/export")
 async def export_marketing_data(campaign_id: Optional[str] = Query(None)):
-    """Export marketing call data.
+    """Export marketing call data as a CSV download.
     
     Args:
         campaign_id: Optional campaign ID filter
         
     Returns:
-        File path information
+        Streaming CSV response
     """
     try:
-        return {
-            "file_path": str(csv_storage.marketing_file),
-            "message": "Marketing data is stored in CSV format",
-            "note": "Download the file directly from the server"
-        }
+        # Campaign IDs come from the query string - keep the header value safe
+        safe_campaign = re.sub(r"[^A-Za-z0-9_.-]", "_", campaign_id or "all")
+        filename = f"marketing_{safe_campaign}.csv"
+        return StreamingResponse(
+            get_csv_storage().iter_marketing_csv(campaign_id),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+        )
     except Exception as e:
         logger.error(f"Error exporting data: {str(e)}")
         raise HTTPException(status_code=500, detail="Error exporting data")
@@ -59,7 +104,7 @@ async def get_metrics_overview():
         Metrics overview dictionary
     """
     try:
-        overview = metrics_storage.get_metrics_overview()
+        overview = get_metrics_storage().get_metrics_overview()
         return overview
     except Exception as e:
         logger.error(f"Error getting metrics overview: {str(e)}")
@@ -82,7 +127,7 @@ async def get_daily_metrics(target_date: Optional[str] = Query(None)):
         else:
             target = None
         
-        summary = metrics_storage.get_daily_summary(target)
+        summary = get_metrics_storage().get_daily_summary(target)
         return summary.dict()
     except Exception as e:
         logger.error(f"Error getting daily metrics: {str(e)}")
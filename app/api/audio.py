@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException
 from fastapi.responses import FileResponse
 from pathlib import Path
 import logging
+import os
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -11,6 +12,18 @@ logger = logging.getLogger(__name__)
 # Audio cache directory
 AUDIO_CACHE_DIR = Path("audio_cache")
 
+# Resolved once at import so requests don't walk the filesystem
+_AUDIO_ROOT = str(AUDIO_CACHE_DIR.resolve())
+
+# Cache-key files are content-addressed (text + voice), so downstream
+# caching is safe
+_AUDIO_HEADERS = {"Cache-Control": "public, max-age=3600"}
+
+# Uncached synthesis (DeepgramTTS._synthesize_temp) reuses one temp_ name
+# per text and overwrites it in place, so clients must not keep a copy
+_TEMP_PREFIX = "temp_"
+_TEMP_AUDIO_HEADERS = {"Cache-Control": "no-store"}
+
 
 @router.get("/{filename}")
 async def serve_audio_file(filename: str):
@@ -23,23 +36,30 @@ async def serve_audio_file(filename: str):
         Audio file response
     """
     try:
-        file_path = AUDIO_CACHE_DIR / filename
-        
-        if not file_path.exists():
-            logger.warning(f"Audio file not found: {filename}")
-            raise HTTPException(status_code=404, detail="Audio file not found")
+        # realpath resolves symlinks as well as "..", so a link inside the
+        # cache directory can't point outside it
+        file_path = os.path.realpath(os.path.join(_AUDIO_ROOT, filename))
         
         # Verify file is within cache directory (security)
-        if not file_path.resolve().is_relative_to(AUDIO_CACHE_DIR.resolve()):
+        if os.path.commonpath([_AUDIO_ROOT, file_path]) != _AUDIO_ROOT:
             logger.error(f"Attempted path traversal: {filename}")
             raise HTTPException(status_code=403, detail="Access denied")
         
+        # Single stat, reused by FileResponse for Content-Length/ETag
+        try:
+            stat_result = os.stat(file_path)
+        except FileNotFoundError:
+            logger.warning(f"Audio file not found: {filename}")
+            raise HTTPException(status_code=404, detail="Audio file not found")
+        
         logger.info(f"Serving audio file: {filename}")
         
         return FileResponse(
-            path=str(file_path),
+            path=file_path,
             media_type="audio/wav",
-            filename=filename
+            filename=filename,
+            stat_result=stat_result,
+            headers=_TEMP_AUDIO_HEADERS if filename.startswith(_TEMP_PREFIX) else _AUDIO_HEADERS
         )
         
     except HTTPException:
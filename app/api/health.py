@@ -1,18 +1,24 @@
 """Health check endpoints."""
 
 from fastapi import APIRouter
+from fastapi.responses import Response
 
 router = APIRouter()
 
+# Probe bodies are constant - render them once at import. A fresh (cheap)
+# Response is still built per hit because middleware appends headers to it.
+_HEALTHY_BODY = b'{"status":"healthy","service":"ai-voice-agent"}'
+_READY_BODY = b'{"status":"ready"}'
+
 
 @router.get("/")
 async def health_check():
     """Basic health check endpoint."""
-    return {"status": "healthy", "service": "ai-voice-agent"}
+    return Response(content=_HEALTHY_BODY, media_type="application/json")
 
 
 @router.get("/ready")
 async def readiness_check():
     """Readiness check for dependent services."""
     # TODO: Check Deepgram, OpenAI, Vobiz connectivity
-    return {"status": "ready"}
+    return Response(content=_READY_BODY, media_type="application/json")
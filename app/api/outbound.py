@@ -1,10 +1,12 @@
 """Outbound call API endpoints."""
 
-from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import Response
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Form, BackgroundTasks, Depends
+from fastapi.responses import ORJSONResponse
+from typing import Final, Optional
 import logging
 
+from app.api.responses import XMLResponse
+from app.config import Settings, get_settings
 from app.storage.models import (
     OutboundCallRequest,
     CallType,
@@ -15,14 +17,51 @@ from app.storage.models import (
 )
 from app.telephony.vobiz_client import vobiz_client
 from app.telephony.session_manager import session_manager
-from app.telephony.xml_builder import VobizXMLResponse, create_error_response
+from app.telephony.xml_builder import VobizXMLResponse, create_error_response, create_goodbye_response
 from app.agent.orchestrator import get_agent
 from app.storage.data_capture import MarketingCallData, extract_user_interest, UserInterest
-from app.storage.csv_storage import csv_storage
+from app.storage.csv_storage import get_csv_storage
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 
+_BANK_PERSONA: Final[str] = "bank"
+
+# Field names Vobiz may use for the call identifier, in priority order
+_CALL_SID_KEYS = ("CallSid", "call_sid", "CallUUID", "call_uuid", "request_uuid", "RequestUUID")
+
+
+def _extract_call_sid(result: dict) -> Optional[str]:
+    """Get the call identifier from a Vobiz API response.
+    
+    Args:
+        result: Vobiz API response
+        
+    Returns:
+        First non-empty call identifier, or None
+    """
+    return next((result[key] for key in _CALL_SID_KEYS if result.get(key)), None)
+
+
+# Static XML replies are rendered once at import and served as bytes
+_FALLBACK_NOTIFICATION_MESSAGE = """Hello. This is an automated test call from the AI voice agent platform.
+This call is being made to verify outbound calling functionality.
+No action is required from you.
+Thank you."""
+
+_FALLBACK_NOTIFICATION_XML = (
+    VobizXMLResponse()
+    .say(_FALLBACK_NOTIFICATION_MESSAGE)
+    .pause(1)
+    .say("Goodbye.")
+    .hangup()
+    .build()
+).encode("utf-8")
+
+_ERROR_XML = create_error_response().encode("utf-8")
+_SESSION_NOT_FOUND_XML = create_error_response("Session not found.").encode("utf-8")
+_THANKS_GOODBYE_XML = create_goodbye_response("Thank you for your time. Goodbye.").encode("utf-8")
+
 
 @router.post("/notification")
 async def initiate_notification_call(
@@ -32,7 +71,8 @@ async def initiate_notification_call(
     priority: str = "normal",
     reference_id: Optional[str] = None,
     from_number: Optional[str] = None,
-    webhook_base_url: str = "https://your-domain.com"  # TODO: Get from config
+    webhook_base_url: Optional[str] = None,
+    config: Settings = Depends(get_settings)
 ):
     """Initiate a notification call.
     
@@ -43,14 +83,14 @@ async def initiate_notification_call(
         priority: Priority level (low, normal, high, urgent)
         reference_id: Optional reference ID for tracking
         from_number: Optional caller ID
-        webhook_base_url: Base URL for webhooks
+        webhook_base_url: Base URL for webhooks (defaults to WEBHOOK_BASE_URL setting)
         
     Returns:
         Call initiation response with call_sid
     """
     try:
-        # Create notification metadata
-        notification_metadata = NotificationMetadata(
+        # Fields come from typed query params - skip re-validation
+        notification_metadata = NotificationMetadata.model_construct(
             notification_type=notification_type,
             priority=priority,
             message=message,
@@ -58,7 +98,7 @@ async def initiate_notification_call(
         )
         
         # Create outbound call request
-        request = OutboundCallRequest(
+        request = OutboundCallRequest.model_construct(
             to_number=to_number,
             from_number=from_number,
             call_type=CallType.NOTIFICATION,
@@ -66,19 +106,15 @@ async def initiate_notification_call(
         )
         
         # Initiate call via Vobiz API
-        result = await vobiz_client.initiate_call(request, webhook_base_url)
+        result = await vobiz_client.initiate_call(
+            request,
+            webhook_base_url or config.WEBHOOK_BASE_URL
+        )
         
         # Create session for tracking (try multiple field names for call_sid)
-        call_sid = (
-            result.get("CallSid") or 
-            result.get("call_sid") or 
-            result.get("CallUUID") or 
-            result.get("call_uuid") or
-            result.get("request_uuid") or
-            result.get("RequestUUID")
-        )
+        call_sid = _extract_call_sid(result)
         
-        logger.info(f"Creating session with call_sid: {call_sid}, Vobiz response: {result}")
+        logger.debug("Creating session with call_sid: %s, Vobiz response: %s", call_sid, result)
         
         if call_sid:
             session = session_manager.create_session(
@@ -97,18 +133,19 @@ async def initiate_notification_call(
             )
             session.notification_metadata = notification_metadata.model_dump()
             
-            logger.info(f"Notification call initiated: {call_sid}")
+            logger.info("Notification call initiated: %s", call_sid)
         
-        return {
+        # Plain JSON-native dict - encode directly, skipping jsonable_encoder
+        return ORJSONResponse({
             "status": "initiated",
             "call_sid": call_sid,
             "to_number": to_number,
             "call_type": "notification",
             "notification_type": notification_type
-        }
+        })
         
     except Exception as e:
-        logger.error(f"Failed to initiate notification call: {str(e)}", exc_info=True)
+        logger.error("Failed to initiate notification call: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to initiate call: {str(e)}")
 
 
@@ -120,7 +157,8 @@ async def initiate_marketing_call(
     segment: Optional[str] = None,
     objective: Optional[str] = None,
     from_number: Optional[str] = None,
-    webhook_base_url: str = "https://your-domain.com"  # TODO: Get from config
+    webhook_base_url: Optional[str] = None,
+    config: Settings = Depends(get_settings)
 ):
     """Initiate a marketing call.
     
@@ -131,14 +169,14 @@ async def initiate_marketing_call(
         segment: Customer segment
         objective: Campaign objective
         from_number: Optional caller ID
-        webhook_base_url: Base URL for webhooks
+        webhook_base_url: Base URL for webhooks (defaults to WEBHOOK_BASE_URL setting)
         
     Returns:
         Call initiation response with call_sid
     """
     try:
-        # Create campaign metadata
-        campaign_metadata = CampaignMetadata(
+        # Fields come from typed query params - skip re-validation
+        campaign_metadata = CampaignMetadata.model_construct(
             campaign_id=campaign_id,
             campaign_name=campaign_name,
             segment=segment,
@@ -146,7 +184,7 @@ async def initiate_marketing_call(
         )
         
         # Create outbound call request
-        request = OutboundCallRequest(
+        request = OutboundCallRequest.model_construct(
             to_number=to_number,
             from_number=from_number,
             call_type=CallType.MARKETING,
@@ -154,10 +192,13 @@ async def initiate_marketing_call(
         )
         
         # Initiate call via Vobiz API
-        result = await vobiz_client.initiate_call(request, webhook_base_url)
+        result = await vobiz_client.initiate_call(
+            request,
+            webhook_base_url or config.WEBHOOK_BASE_URL
+        )
         
         # Create session for tracking
-        call_sid = result.get("CallSid") or result.get("call_sid")
+        call_sid = _extract_call_sid(result)
         if call_sid:
             session = session_manager.create_session(
                 call_id=call_sid,
@@ -175,72 +216,51 @@ async def initiate_marketing_call(
             )
             session.campaign_metadata = campaign_metadata.model_dump()
             
-            logger.info(f"Marketing call initiated: {call_sid} for campaign {campaign_id}")
+            logger.info("Marketing call initiated: %s for campaign %s", call_sid, campaign_id)
         
-        return {
+        return ORJSONResponse({
             "status": "initiated",
             "call_sid": call_sid,
             "to_number": to_number,
             "call_type": "marketing",
             "campaign_id": campaign_id,
             "campaign_name": campaign_name
-        }
+        })
         
     except Exception as e:
-        logger.error(f"Failed to initiate marketing call: {str(e)}", exc_info=True)
+        logger.error("Failed to initiate marketing call: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to initiate call: {str(e)}")
 
 
 @router.post("/notification/handle")
-async def handle_notification_call(request: Request):
+async def handle_notification_call(
+    CallSid: Optional[str] = Form(None),
+    call_sid: Optional[str] = Form(None),
+    CallUUID: Optional[str] = Form(None),
+    call_uuid: Optional[str] = Form(None)
+):
     """Handle notification call webhook from Vobiz.ai.
     
     This webhook is called when the notification call is answered.
     Returns XML to play the notification message.
     """
     try:
-        # Parse form data
-        form_data = await request.form()
-        
-        # Log all form data to debug
-        logger.info(f"Notification webhook received. Form data: {dict(form_data)}")
-        
         # Try multiple field names for call_sid (Vobiz might use different naming)
-        call_sid = (
-            form_data.get("CallSid") or 
-            form_data.get("call_sid") or 
-            form_data.get("CallUUID") or
-            form_data.get("call_uuid")
-        )
+        call_sid = CallSid or call_sid or CallUUID or call_uuid
         
-        logger.info(f"Notification call answered: {call_sid}")
+        logger.info("Notification call answered: %s", call_sid)
         
         # Get session
         session = session_manager.get_session(call_sid)
         
         # Fallback: If session not found, use default test message
         if not session or not session.notification_metadata:
-            logger.warning(f"Session or notification metadata not found: {call_sid}. Using fallback message.")
+            logger.warning("Session or notification metadata not found: %s. Using fallback message.", call_sid)
             
             # Use default test message as fallback
-            default_message = """Hello. This is an automated test call from the AI voice agent platform.
-This call is being made to verify outbound calling functionality.
-No action is required from you.
-Thank you."""
-            
-            # Build simple XML response with default message
-            xml_response = (
-                VobizXMLResponse()
-                .say(default_message)
-                .pause(1)
-                .say("Goodbye.")
-                .hangup()
-                .build()
-            )
+            logger.debug("Sending fallback XML response: %s", _FALLBACK_NOTIFICATION_XML)
             
-            logger.info(f"Sending fallback XML response: {xml_response}")
-            
-            return Response(content=xml_response, media_type="application/xml")
+            return XMLResponse(_FALLBACK_NOTIFICATION_XML)
         
         # Update status
         session_manager.update_status(call_sid, CallStatus.IN_PROGRESS)
@@ -249,7 +269,7 @@ Thank you."""
         message = session.notification_metadata.get("message", "This is a notification.")
         
         # Generate AI response for notification delivery
-        agent = get_agent(persona="bank")
+        agent = get_agent(_BANK_PERSONA)
         ai_response = await agent.generate_notification_response(message, call_sid)
         
         # Build XML response to deliver notification
@@ -262,34 +282,30 @@ Thank you."""
             .build()
         )
         
-        return Response(content=xml_response, media_type="application/xml")
+        return XMLResponse(xml_response)
         
     except Exception as e:
-        logger.error(f"Error handling notification call: {str(e)}", exc_info=True)
-        error_xml = create_error_response()
-        return Response(content=error_xml, media_type="application/xml")
+        logger.error("Error handling notification call: %s", e, exc_info=True)
+        return XMLResponse(_ERROR_XML)
 
 
 @router.post("/marketing/handle")
-async def handle_marketing_call(request: Request):
+async def handle_marketing_call(CallSid: Optional[str] = Form(None)):
     """Handle marketing call webhook from Vobiz.ai.
     
     This webhook is called when the marketing call is answered.
     Returns XML to start the marketing conversation.
     """
     try:
-        # Parse form data
-        form_data = await request.form()
-        call_sid = form_data.get("CallSid")
+        call_sid = CallSid
         
-        logger.info(f"Marketing call answered: {call_sid}")
+        logger.info("Marketing call answered: %s", call_sid)
         
         # Get session
         session = session_manager.get_session(call_sid)
         if not session or not session.campaign_metadata:
-            logger.warning(f"Session or campaign metadata not found: {call_sid}")
-            error_xml = create_error_response("Session not found.")
-            return Response(content=error_xml, media_type="application/xml")
+            logger.warning("Session or campaign metadata not found: %s", call_sid)
+            return XMLResponse(_SESSION_NOT_FOUND_XML)
         
         # Update status
         session_manager.update_status(call_sid, CallStatus.IN_PROGRESS)
@@ -300,7 +316,7 @@ async def handle_marketing_call(request: Request):
         segment = session.campaign_metadata.get("segment", "valued customers")
         
         # Generate AI marketing message
-        agent = get_agent(persona="bank")
+        agent = get_agent(_BANK_PERSONA)
         ai_message = await agent.generate_marketing_response(
             campaign_name=campaign_name,
             objective=objective,
@@ -326,34 +342,39 @@ async def handle_marketing_call(request: Request):
             .build()
         )
         
-        return Response(content=xml_response, media_type="application/xml")
+        return XMLResponse(xml_response)
         
     except Exception as e:
-        logger.error(f"Error handling marketing call: {str(e)}", exc_info=True)
-        error_xml = create_error_response()
-        return Response(content=error_xml, media_type="application/xml")
+        logger.error("Error handling marketing call: %s", e, exc_info=True)
+        return XMLResponse(_ERROR_XML)
 
 
 @router.post("/marketing/gather/{call_id}")
-async def handle_marketing_gather(call_id: str, request: Request):
+async def handle_marketing_gather(
+    call_id: str,
+    background_tasks: BackgroundTasks,
+    SpeechResult: Optional[str] = Form(None)
+):
     """Handle gathered response from marketing call.
     
     This captures the user's response to marketing questions.
     """
     try:
-        form_data = await request.form()
-        speech_result = form_data.get("SpeechResult")
+        speech_result = SpeechResult
+        
+        logger.info("Marketing call response for %s: %s", call_id, speech_result)
         
-        logger.info(f"Marketing call response for {call_id}: {speech_result}")
+        # No-speech timeouts are common in IVR flows; skip the LLM and CSV write
+        if not speech_result:
+            return XMLResponse(_THANKS_GOODBYE_XML)
         
         # Get session
         session = session_manager.get_session(call_id)
         if not session:
-            error_xml = create_error_response("Session not found.")
-            return Response(content=error_xml, media_type="application/xml")
+            return XMLResponse(_SESSION_NOT_FOUND_XML)
         
         # Process response with AI agent
-        agent = get_agent(persona="bank")
+        agent = get_agent(_BANK_PERSONA)
         campaign_name = session.campaign_metadata.get("campaign_name", "our service")
         objective = session.campaign_metadata.get("objective", "product promotion")
         segment = session.campaign_metadata.get("segment", "valued customers")
@@ -362,7 +383,7 @@ async def handle_marketing_gather(call_id: str, request: Request):
             campaign_name=campaign_name,
             objective=objective,
             segment=segment,
-            user_input=speech_result or "No response",
+            user_input=speech_result,
             session_id=call_id
         )
         
@@ -370,7 +391,7 @@ async def handle_marketing_gather(call_id: str, request: Request):
         session_manager.add_conversation_turn(
             call_id=call_id,
             role="user",
-            content=speech_result or "No response",
+            content=speech_result,
             metadata={"input_type": "speech", "marketing_response": True}
         )
         
@@ -382,7 +403,7 @@ async def handle_marketing_gather(call_id: str, request: Request):
         )
         
         # Extract and save structured data
-        user_interest = extract_user_interest(speech_result or "")
+        user_interest = extract_user_interest(speech_result)
         
         # Calculate call duration
         call_duration = None
@@ -402,12 +423,12 @@ async def handle_marketing_gather(call_id: str, request: Request):
             segment=session.campaign_metadata.get("segment"),
             objective=session.campaign_metadata.get("objective"),
             call_status="completed",
-            notes=f"User response: {speech_result[:100] if speech_result else 'No response'}"
+            notes=f"User response: {speech_result[:100]}"
         )
         
-        # Save to CSV
-        csv_storage.save_marketing_call(marketing_data)
-        logger.info(f"Marketing data captured: {call_id}, interest={user_interest}")
+        # Save to CSV after the XML reply is sent (sync writer runs in the threadpool)
+        background_tasks.add_task(get_csv_storage().save_marketing_call, marketing_data)
+        logger.info("Marketing data captured: %s, interest=%s", call_id, user_interest)
         
         # Build response
         xml_response = (
@@ -418,9 +439,8 @@ async def handle_marketing_gather(call_id: str, request: Request):
             .build()
         )
         
-        return Response(content=xml_response, media_type="application/xml")
+        return XMLResponse(xml_response)
         
     except Exception as e:
-        logger.error(f"Error handling marketing gather: {str(e)}", exc_info=True)
-        error_xml = create_error_response()
-        return Response(content=error_xml, media_type="application/xml")
+        logger.error("Error handling marketing gather: %s", e, exc_info=True)
+        return XMLResponse(_ERROR_XML)
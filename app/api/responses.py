@@ -0,0 +1,44 @@
+"""Shared response classes for API handlers."""
+
+from typing import Any, Mapping, Optional
+
+from fastapi.responses import Response
+
+
+class XMLResponse(Response):
+    """Vobiz XML reply, sent as UTF-8 bytes and never cached."""
+    
+    media_type = "application/xml"
+    
+    def __init__(
+        self,
+        content: Any = None,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        **kwargs: Any
+    ):
+        """Initialize XML response.
+        
+        Args:
+            content: XML as str or prebuilt bytes
+            status_code: HTTP status code
+            headers: Extra headers
+        """
+        # Call-control XML is per-call state; keep proxies from replaying it
+        merged = {"cache-control": "no-store"}
+        if headers:
+            merged.update(headers)
+        super().__init__(content, status_code=status_code, headers=merged, **kwargs)
+    
+    def render(self, content: Any) -> bytes:
+        """Encode str content once; prebuilt bytes pass straight through.
+        
+        Args:
+            content: XML as str or bytes
+        
+        Returns:
+            Response body bytes
+        """
+        if isinstance(content, bytes):
+            return content
+        return content.encode("utf-8")
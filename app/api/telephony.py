@@ -1,10 +1,13 @@
 """Telephony webhook handlers for Vobiz.ai."""
 
-from fastapi import APIRouter, Request, Form, HTTPException
-from fastapi.responses import Response
-from typing import Optional
+from fastapi import APIRouter, Request, Form, HTTPException, Depends
+from fastapi.responses import ORJSONResponse
+from typing import Final, Optional
+import asyncio
 import logging
 
+from app.api.responses import XMLResponse
+from app.config import Settings, get_settings
 from app.storage.models import VobizCallEvent, CallDirection, CallStatus, CallType
 from app.telephony.session_manager import session_manager
 from app.telephony.xml_builder import (
@@ -13,16 +16,64 @@ from app.telephony.xml_builder import (
     create_goodbye_response,
     VobizXMLResponse
 )
-from app.speech.processor import SpeechProcessor, generate_telephony_response
+from app.speech.processor import (
+    SpeechProcessor,
+    generate_telephony_response,
+    cached_telephony_response
+)
 from app.agent.orchestrator import process_call_input, get_agent
 from app.storage.metrics import calculate_call_metrics
-from app.storage.metrics_storage import metrics_storage
+from app.storage.metrics_storage import get_metrics_storage
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 
-# TODO: Get from config or environment
-BASE_URL = "https://your-domain.com"  # Replace with actual public URL
+_BANK_PERSONA: Final[str] = "bank"
+
+# Vobiz status string -> CallStatus, built once at import
+_STATUS_MAP = {
+    "initiated": CallStatus.INITIATED,
+    "ringing": CallStatus.RINGING,
+    "in-progress": CallStatus.IN_PROGRESS,
+    "completed": CallStatus.COMPLETED,
+    "failed": CallStatus.FAILED,
+    "busy": CallStatus.BUSY,
+    "no-answer": CallStatus.NO_ANSWER
+}
+
+_TERMINAL_STATUSES = frozenset({
+    CallStatus.COMPLETED,
+    CallStatus.FAILED,
+    CallStatus.NO_ANSWER,
+    CallStatus.BUSY
+})
+
+# Static spoken prompts, synthesized once and replayed from the TTS cache
+_WELCOME_TEXT = "Welcome to our service. How may I help you today?"
+_FOLLOWUP_TEXT = "Is there anything else I can help you with?"
+
+# Static XML replies are rendered once at import and served as bytes
+_ERROR_XML = create_error_response().encode("utf-8")
+_SESSION_NOT_FOUND_XML = create_error_response("Session not found.").encode("utf-8")
+_NO_INPUT_XML = create_goodbye_response("I didn't receive any input. Goodbye.").encode("utf-8")
+_OUTGOING_UNSUPPORTED_XML = create_error_response("Outgoing calls not yet supported.").encode("utf-8")
+_NOTIFICATION_UNSUPPORTED_XML = create_error_response("Notification calls not yet supported.").encode("utf-8")
+_MARKETING_UNSUPPORTED_XML = create_error_response("Marketing calls not yet supported.").encode("utf-8")
+
+
+async def warm_prompt_cache():
+    """Synthesize the static call prompts before the first call arrives.
+    
+    Meant to run as a background task at startup so the first caller
+    doesn't wait on Deepgram connection setup and synthesis.
+    """
+    prompts = (_WELCOME_TEXT, _FOLLOWUP_TEXT)
+    results = await asyncio.gather(
+        *(cached_telephony_response(text, language="en-IN") for text in prompts),
+        return_exceptions=True
+    )
+    warmed = sum(1 for result in results if result and not isinstance(result, BaseException))
+    logger.info("Warmed %d/%d static prompts", warmed, len(prompts))
 
 
 @router.post("/incoming")
@@ -30,10 +81,11 @@ async def handle_incoming_call(
     CallSid: str = Form(...),
     From: str = Form(...),
     To: str = Form(...),
-    CallStatus: Optional[str] = Form(None),
+    call_status: Optional[str] = Form(None, alias="CallStatus"),
     Direction: Optional[str] = Form(None),
     AccountSid: Optional[str] = Form(None),
-    ApiVersion: Optional[str] = Form(None)
+    ApiVersion: Optional[str] = Form(None),
+    config: Settings = Depends(get_settings)
 ):
     """Handle incoming call webhook from Vobiz.ai.
     
@@ -46,13 +98,13 @@ async def handle_incoming_call(
             CallSid=CallSid,
             From=From,
             To=To,
-            CallStatus=CallStatus,
+            CallStatus=call_status,
             Direction=Direction,
             AccountSid=AccountSid,
             ApiVersion=ApiVersion
         )
         
-        logger.info(f"Incoming call: {event.CallSid} from {event.From} to {event.To}")
+        logger.info("Incoming call: %s from %s to %s", event.CallSid, event.From, event.To)
         
         # Create call session
         session = session_manager.create_session(
@@ -71,11 +123,10 @@ async def handle_incoming_call(
         # Update status to in-progress
         session_manager.update_status(event.CallSid, CallStatus.IN_PROGRESS)
         
-        logger.info(f"Session created: {session.call_id}")
+        logger.info("Session created: %s", session.call_id)
         
         # Generate welcome message using Deepgram TTS
-        welcome_text = "Welcome to our service. How may I help you today?"
-        audio_path = await generate_telephony_response(welcome_text, language="en-IN")
+        audio_path = await cached_telephony_response(_WELCOME_TEXT, language="en-IN")
         
         # Build callback URL for gathering speech
         callback_url = f"/telephony/gather/{event.CallSid}"
@@ -83,7 +134,7 @@ async def handle_incoming_call(
         # Build XML response with TTS audio
         if audio_path:
             # Convert local path to public URL
-            audio_url = SpeechProcessor.get_audio_url_for_playback(audio_path, BASE_URL)
+            audio_url = SpeechProcessor.get_audio_url_for_playback(audio_path, config.WEBHOOK_BASE_URL)
             
             xml_response = (
                 VobizXMLResponse()
@@ -102,12 +153,11 @@ async def handle_incoming_call(
             # Fallback to XML Say if TTS fails
             xml_response = create_welcome_response(callback_url)
         
-        return Response(content=xml_response, media_type="application/xml")
+        return XMLResponse(xml_response)
         
     except Exception as e:
-        logger.error(f"Error handling incoming call: {str(e)}", exc_info=True)
-        error_xml = create_error_response()
-        return Response(content=error_xml, media_type="application/xml")
+        logger.error("Error handling incoming call: %s", e, exc_info=True)
+        return XMLResponse(_ERROR_XML)
 
 
 @router.post("/gather/{call_id}")
@@ -115,21 +165,21 @@ async def handle_gather_response(
     call_id: str,
     SpeechResult: Optional[str] = Form(None),
     Digits: Optional[str] = Form(None),
-    CallSid: Optional[str] = Form(None)
+    CallSid: Optional[str] = Form(None),
+    config: Settings = Depends(get_settings)
 ):
     """Handle gathered input (speech or DTMF) from caller.
     
     This webhook receives the user's speech or keypad input.
     """
     try:
-        logger.info(f"Gather response for call {call_id}: speech={SpeechResult}, digits={Digits}")
+        logger.info("Gather response for call %s: speech=%s, digits=%s", call_id, SpeechResult, Digits)
         
         # Get session
         session = session_manager.get_session(call_id)
         if not session:
-            logger.warning(f"Session not found: {call_id}")
-            error_xml = create_error_response("Session not found.")
-            return Response(content=error_xml, media_type="application/xml")
+            logger.warning("Session not found: %s", call_id)
+            return XMLResponse(_SESSION_NOT_FOUND_XML)
         
         # Process speech input
         if SpeechResult:
@@ -141,13 +191,13 @@ async def handle_gather_response(
                 metadata={"input_type": "speech"}
             )
             
-            logger.info(f"User said: {SpeechResult}")
+            logger.info("User said: %s", SpeechResult)
             
             # Process with AI agent
             response_text = await process_call_input(
                 user_input=SpeechResult,
                 session_id=call_id,
-                persona="bank",  # TODO: Get from session metadata
+                persona=_BANK_PERSONA,  # TODO: Get from session metadata
                 context={
                     "call_type": session.call_type,
                     "direction": session.direction
@@ -161,19 +211,26 @@ async def handle_gather_response(
                 content=response_text
             )
             
-            # Generate TTS for response
-            audio_path = await generate_telephony_response(response_text, language="en-IN")
+            # Generate TTS for response and the follow-up prompt concurrently
+            followup_text = _FOLLOWUP_TEXT
+            audio_path, followup_audio = await asyncio.gather(
+                generate_telephony_response(response_text, language="en-IN"),
+                cached_telephony_response(followup_text, language="en-IN"),
+                return_exceptions=True
+            )
+            if isinstance(audio_path, BaseException):
+                logger.error("TTS failed for response: %s", audio_path)
+                audio_path = None
+            if isinstance(followup_audio, BaseException):
+                logger.error("TTS failed for follow-up: %s", followup_audio)
+                followup_audio = None
             
             # Build response with next gather
             callback_url = f"/telephony/gather/{call_id}"
             
             if audio_path:
-                audio_url = SpeechProcessor.get_audio_url_for_playback(audio_path, BASE_URL)
-                
-                # Generate follow-up question audio
-                followup_text = "Is there anything else I can help you with?"
-                followup_audio = await generate_telephony_response(followup_text, language="en-IN")
-                followup_url = SpeechProcessor.get_audio_url_for_playback(followup_audio, BASE_URL) if followup_audio else None
+                audio_url = SpeechProcessor.get_audio_url_for_playback(audio_path, config.WEBHOOK_BASE_URL)
+                followup_url = SpeechProcessor.get_audio_url_for_playback(followup_audio, config.WEBHOOK_BASE_URL) if followup_audio else None
                 
                 xml_response = (
                     VobizXMLResponse()
@@ -190,13 +247,15 @@ async def handle_gather_response(
                     xml_response.play(followup_url)
                 else:
                     xml_response.say(followup_text)
+                
+                xml_response = xml_response.build()
             else:
                 # Fallback to XML Say
                 xml_response = (
                     VobizXMLResponse()
                     .say(response_text)
                     .gather_with_prompt(
-                        prompt_text="Is there anything else I can help you with?",
+                        prompt_text=followup_text,
                         action=callback_url,
                         timeout=5,
                         input_type="speech"
@@ -206,7 +265,7 @@ async def handle_gather_response(
                 .build()
             )
             
-            return Response(content=xml_response, media_type="application/xml")
+            return XMLResponse(xml_response)
         
         # Process DTMF input
         elif Digits:
@@ -217,7 +276,7 @@ async def handle_gather_response(
                 metadata={"input_type": "dtmf"}
             )
             
-            logger.info(f"User pressed: {Digits}")
+            logger.info("User pressed: %s", Digits)
             
             # Handle DTMF menu options
             response_text = f"You pressed {Digits}."
@@ -229,24 +288,22 @@ async def handle_gather_response(
                 .build()
             )
             
-            return Response(content=xml_response, media_type="application/xml")
+            return XMLResponse(xml_response)
         
         # No input received
         else:
-            logger.info(f"No input received for call {call_id}")
-            xml_response = create_goodbye_response("I didn't receive any input. Goodbye.")
-            return Response(content=xml_response, media_type="application/xml")
+            logger.info("No input received for call %s", call_id)
+            return XMLResponse(_NO_INPUT_XML)
         
     except Exception as e:
-        logger.error(f"Error handling gather response: {str(e)}", exc_info=True)
-        error_xml = create_error_response()
-        return Response(content=error_xml, media_type="application/xml")
+        logger.error("Error handling gather response: %s", e, exc_info=True)
+        return XMLResponse(_ERROR_XML)
 
 
 @router.post("/events")
 async def handle_call_events(
     CallSid: str = Form(...),
-    CallStatus: Optional[str] = Form(None),
+    call_status: Optional[str] = Form(None, alias="CallStatus"),
     CallDuration: Optional[str] = Form(None),
     RecordingUrl: Optional[str] = Form(None),
     RecordingDuration: Optional[str] = Form(None)
@@ -256,47 +313,35 @@ async def handle_call_events(
     This webhook receives asynchronous events about call state changes.
     """
     try:
-        logger.info(f"Call event: {CallSid} status={CallStatus} duration={CallDuration}")
+        logger.info("Call event: %s status=%s duration=%s", CallSid, call_status, CallDuration)
         
         session = session_manager.get_session(CallSid)
         
         # Map Vobiz status to our status enum
-        status_mapping = {
-            "initiated": CallStatus.INITIATED,
-            "ringing": CallStatus.RINGING,
-            "in-progress": CallStatus.IN_PROGRESS,
-            "completed": CallStatus.COMPLETED,
-            "failed": CallStatus.FAILED,
-            "busy": CallStatus.BUSY,
-            "no-answer": CallStatus.NO_ANSWER
-        }
+        new_status = _STATUS_MAP.get(call_status.lower()) if call_status else None
         
-        if CallStatus and CallStatus.lower() in status_mapping:
-            new_status = status_mapping[CallStatus.lower()]
-            
-            if session:
-                session_manager.update_status(CallSid, new_status)
-                logger.info(f"Updated session {CallSid} to status {new_status}")
+        if new_status is not None and session:
+            session_manager.update_status_session(session, new_status)
+            logger.info("Updated session %s to status %s", CallSid, new_status)
             
             # If call ended, clean up session
-            if new_status in [CallStatus.COMPLETED, CallStatus.FAILED, CallStatus.NO_ANSWER, CallStatus.BUSY]:
-                if session:
-                    ended_session = session_manager.end_session(CallSid)
-                    logger.info(f"Call ended: {CallSid}, duration: {CallDuration}s")
-                    
-                    # TODO: Persist call record to database
-                    # TODO: Save transcript and metadata
+            if new_status in _TERMINAL_STATUSES:
+                session_manager.end_session_obj(session)
+                logger.info("Call ended: %s, duration: %ss", CallSid, CallDuration)
+                
+                # TODO: Persist call record to database
+                # TODO: Save transcript and metadata
         
         # Handle recording URL if provided
         if RecordingUrl and session:
             session.metadata["recording_url"] = RecordingUrl
             session.metadata["recording_duration"] = RecordingDuration
-            logger.info(f"Recording available: {RecordingUrl}")
+            logger.info("Recording available: %s", RecordingUrl)
         
-        return {"status": "received"}
+        return ORJSONResponse({"status": "received"})
         
     except Exception as e:
-        logger.error(f"Error handling call event: {str(e)}", exc_info=True)
+        logger.error("Error handling call event: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -305,7 +350,7 @@ async def handle_outgoing_call(request: Request):
     """Handle outgoing call webhook from Vobiz.ai."""
     # TODO: Implement outgoing call handling
     logger.info("Outgoing call handler - not yet implemented")
-    return Response(content=create_error_response("Outgoing calls not yet supported."), media_type="application/xml")
+    return XMLResponse(_OUTGOING_UNSUPPORTED_XML)
 
 
 @router.post("/notification")
@@ -313,7 +358,7 @@ async def handle_notification_call(request: Request):
     """Handle notification call webhook from Vobiz.ai."""
     # TODO: Implement notification call handling
     logger.info("Notification call handler - not yet implemented")
-    return Response(content=create_error_response("Notification calls not yet supported."), media_type="application/xml")
+    return XMLResponse(_NOTIFICATION_UNSUPPORTED_XML)
 
 
 @router.post("/marketing")
@@ -321,9 +366,12 @@ async def handle_marketing_call(request: Request):
     """Handle marketing call webhook from Vobiz.ai."""
     # TODO: Implement marketing call handling
     logger.info("Marketing call handler - not yet implemented")
-    return Response(content=create_error_response("Marketing calls not yet supported."), media_type="application/xml")
+    return XMLResponse(_MARKETING_UNSUPPORTED_XML)
 
 
+# The debug session endpoints stay ``async def``: FastAPI dispatches plain
+# ``def`` handlers to the threadpool, which costs more than a coroutine that
+# never awaits for a lookup this small.
 @router.get("/session/{call_id}")
 async def get_session_info(call_id: str):
     """Get current session information (for debugging/monitoring).
@@ -338,7 +386,7 @@ async def get_session_info(call_id: str):
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    return session
+    return ORJSONResponse(session.to_model().model_dump(mode="json"))
 
 
 @router.get("/sessions")
@@ -349,7 +397,10 @@ async def list_active_sessions():
         Dictionary of active sessions
     """
     sessions = session_manager.get_active_sessions()
-    return {
+    return ORJSONResponse({
         "count": len(sessions),
-        "sessions": sessions
-    }
+        "sessions": {
+            call_id: session.to_model().model_dump(mode="json")
+            for call_id, session in sessions.items()
+        }
+    })
@@ -1,5 +1,7 @@
 """Application configuration using environment variables."""
 
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,15 +12,21 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     ENVIRONMENT: str = "development"
+    DEBUG: bool = False  # Verbose agent tracing (stdout) - keep off in production
+    WEBHOOK_BASE_URL: str = "https://your-domain.com"  # Public URL for webhooks and audio playback
 
     # Vobiz.ai Configuration
     VOBIZ_AUTH_ID: str
     VOBIZ_AUTH_TOKEN: str
     VOBIZ_API_URL: str = "https://api.vobiz.ai"
     VOBIZ_FROM_NUMBER: str = "+912271264233"  # Default caller ID for outbound calls
+    SESSION_IDLE_TIMEOUT: int = 3600  # Seconds without webhooks before a call session is dropped
 
     # Deepgram Configuration
     DEEPGRAM_API_KEY: str
+    TTS_MAX_CONCURRENCY: int = 8  # Max in-flight Deepgram TTS requests per process
+    TTS_CACHE_S3_BUCKET: str = ""  # Shared TTS audio cache bucket (empty = local disk only)
+    TTS_CACHE_S3_PREFIX: str = "tts-cache/"
 
     # OpenAI Configuration
     OPENAI_API_KEY: str
@@ -37,5 +45,15 @@ class Settings(BaseSettings):
     )
 
 
+@lru_cache
+def get_settings() -> Settings:
+    """Get application settings (loaded once, usable as a FastAPI dependency).
+    
+    Returns:
+        Settings instance
+    """
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -1,17 +1,35 @@
 """FastAPI application entrypoint."""
 
+import asyncio
+import sys
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
 from app.api import telephony, health, outbound, audio, analytics
+from app.agent.orchestrator import close_http_client
+from app.speech.stt import close_stt_pool
+from app.speech.tts import deepgram_tts
+from app.storage.csv_storage import get_csv_storage
+from app.storage.metrics_storage import get_metrics_storage
+from app.telephony.session_manager import session_manager
+from app.telephony.vobiz_client import vobiz_client
+
+# Use libuv-based event loop where available (not on Windows)
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
 
 # Initialize FastAPI app
 app = FastAPI(
     title="AI Voice Agent",
     description="Real-time AI voice agent for BFSI sector",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -35,14 +53,32 @@ app.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
 async def startup_event():
     """Initialize services on startup."""
     # TODO: Initialize database connections, cache, etc.
-    pass
+    vobiz_client.start()
+    
+    # Drop sessions of calls whose final webhook never arrived
+    app.state.session_evictor = asyncio.create_task(
+        session_manager.run_evictor(settings.SESSION_IDLE_TIMEOUT)
+    )
+    
+    # Warm Deepgram and the static prompt cache without delaying startup
+    app.state.prompt_warmup = asyncio.create_task(telephony.warm_prompt_cache())
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
-    # TODO: Close connections, cleanup resources
-    pass
+    # TODO: Close remaining connections, cleanup resources
+    warmup = getattr(app.state, "prompt_warmup", None)
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+    app.state.session_evictor.cancel()
+    await close_http_client()
+    await vobiz_client.close()
+    await close_stt_pool()
+    await deepgram_tts.close()
+    # Write out batched CSV rows before the process exits
+    get_csv_storage().close()
+    get_metrics_storage().close()
 
 
 if __name__ == "__main__":
@@ -51,4 +87,8 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.ENVIRONMENT == "development",
+        # Pin the uvicorn[standard] fast paths instead of relying on "auto"
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets",
     )
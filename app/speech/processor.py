@@ -4,16 +4,69 @@ This module provides clean separation between telephony logic and speech process
 Telephony handlers call these abstractions without Deepgram-specific knowledge.
 """
 
+import asyncio
+import functools
 import logging
-from typing import Optional
-from pathlib import Path
+import os
+import re
+from typing import AsyncIterator, Dict, Optional, Tuple
 
 from app.speech.stt import deepgram_stt_simple, DeepgramSTT
 from app.speech.tts import deepgram_tts, TTSVoiceConfig
 from app.utils.audio_utils import validate_telephony_audio
+from app.utils.logger import ThrottledErrorLog
 
 logger = logging.getLogger(__name__)
 
+# Last-resort boundary for the telephony layer; tracebacks are capped
+_error_log = ThrottledErrorLog(logger)
+
+# Expand common abbreviations for Indian context
+_REPLACEMENTS: Dict[str, str] = {
+    "OTP": "O T P",
+    "KYC": "K Y C",
+    "PAN": "P A N",
+    "GST": "G S T",
+    "UPI": "U P I",
+    "NEFT": "N E F T",
+    "RTGS": "R T G S",
+    "IFSC": "I F S C",
+    "Rs.": "Rupees",
+    "₹": "Rupees",
+    "&": "and",
+}
+
+# Longest keys first so a longer abbreviation wins over any prefix of it
+_SANITIZE_RE = re.compile(
+    "|".join(re.escape(key) for key in sorted(_REPLACEMENTS, key=len, reverse=True))
+)
+
+
+def _expand_abbreviation(match: "re.Match[str]") -> str:
+    """Map a matched abbreviation to its spoken form."""
+    return _REPLACEMENTS[match.group(0)]
+
+
+@functools.lru_cache(maxsize=1024)
+def _sanitize_text_for_tts(text: str) -> str:
+    """Sanitize text for TTS synthesis.
+    
+    Prompts repeat heavily across calls (greetings, OTP prompts, holds),
+    so results are memoized.
+    
+    Args:
+        text: Raw text
+    
+    Returns:
+        Sanitized text
+    """
+    # Basic sanitization, then expand abbreviations in a single pass
+    return _SANITIZE_RE.sub(_expand_abbreviation, text.strip())
+
+
+# Per-response cap on concurrent Deepgram requests while pipelining sentences
+_MAX_TTS_IN_FLIGHT = 3
+
 
 class SpeechProcessor:
     """High-level speech processing interface for telephony.
@@ -33,11 +86,11 @@ class SpeechProcessor:
             Transcribed text or None
         """
         try:
-            logger.info(f"Transcribing audio from URL: {audio_url}")
+            logger.info("Transcribing audio from URL: %s", audio_url)
             transcript = await deepgram_stt_simple.transcribe_url(audio_url)
             return transcript
         except Exception as e:
-            logger.error(f"Error transcribing audio URL: {str(e)}", exc_info=True)
+            _error_log.error("Error transcribing audio URL: %s", e)
             return None
     
     @staticmethod
@@ -58,12 +111,12 @@ class SpeechProcessor:
         """
         try:
             # Sanitize text for TTS (remove symbols, abbreviations)
-            sanitized_text = SpeechProcessor._sanitize_text_for_tts(text)
+            sanitized_text = _sanitize_text_for_tts(text)
             
             # Get appropriate voice for language
             voice = TTSVoiceConfig.get_voice_for_language(language)
             
-            logger.info(f"Generating speech: '{sanitized_text[:50]}...' in {language}")
+            logger.info("Generating speech: '%s...' in %s", sanitized_text[:50], language)
             
             audio_path = await deepgram_tts.synthesize(
                 text=sanitized_text,
@@ -72,12 +125,12 @@ class SpeechProcessor:
             )
             
             if audio_path:
-                logger.info(f"Speech generated: {audio_path}")
+                logger.info("Speech generated: %s", audio_path)
             
             return audio_path
             
         except Exception as e:
-            logger.error(f"Error generating speech: {str(e)}", exc_info=True)
+            _error_log.error("Error generating speech: %s", e)
             return None
     
     @staticmethod
@@ -95,7 +148,7 @@ class SpeechProcessor:
             Audio bytes or None
         """
         try:
-            sanitized_text = SpeechProcessor._sanitize_text_for_tts(text)
+            sanitized_text = _sanitize_text_for_tts(text)
             voice = TTSVoiceConfig.get_voice_for_language(language)
             
             audio_bytes = await deepgram_tts.synthesize_streaming(
@@ -109,9 +162,98 @@ class SpeechProcessor:
             return None
             
         except Exception as e:
-            logger.error(f"Error generating streaming speech: {str(e)}", exc_info=True)
+            _error_log.error("Error generating streaming speech: %s", e)
             return None
     
+    @staticmethod
+    async def stream_speech(
+        text: str,
+        language: str = "en-IN"
+    ) -> AsyncIterator[bytes]:
+        """Generate speech audio as an iterator of chunks.
+        
+        Chunks are yielded as soon as Deepgram sends them so the caller can
+        start playback before synthesis completes.
+        
+        Args:
+            text: Text to synthesize
+            language: Language code
+            
+        Yields:
+            Audio byte chunks
+        """
+        sanitized_text = _sanitize_text_for_tts(text)
+        voice = TTSVoiceConfig.get_voice_for_language(language)
+        
+        async for chunk in deepgram_tts.synthesize_chunks(sanitized_text, voice_override=voice):
+            yield chunk
+    
+    @staticmethod
+    async def generate_speech_sentences(
+        sentences: AsyncIterator[str],
+        language: str = "en-IN"
+    ) -> AsyncIterator[bytes]:
+        """Synthesize a stream of reply sentences as they arrive.
+        
+        Takes the sentences yielded by stream_call_input (the agent does the
+        splitting), so each is sent to TTS while the LLM keeps generating
+        and first audio is ready after one sentence instead of the whole
+        reply. Audio is yielded in sentence order.
+        
+        Args:
+            sentences: Async iterator of voice-ready sentences
+            language: Language code
+            
+        Yields:
+            Audio bytes, one item per sentence
+        """
+        voice = TTSVoiceConfig.get_voice_for_language(language)
+        semaphore = asyncio.Semaphore(_MAX_TTS_IN_FLIGHT)
+        ordered: asyncio.Queue = asyncio.Queue()
+        
+        async def synthesize(sentence: str) -> bytes:
+            async with semaphore:
+                sanitized_text = _sanitize_text_for_tts(sentence)
+                return b"".join([
+                    chunk async for chunk in deepgram_tts.synthesize_chunks(sanitized_text, voice_override=voice)
+                ])
+        
+        async def produce():
+            try:
+                async for sentence in sentences:
+                    if sentence.strip():
+                        ordered.put_nowait(asyncio.create_task(synthesize(sentence)))
+            finally:
+                ordered.put_nowait(None)
+        
+        producer = asyncio.create_task(produce())
+        pending = []
+        try:
+            while True:
+                task = await ordered.get()
+                if task is None:
+                    break
+                pending.append(task)
+                audio = await task
+                pending.remove(task)
+                if audio:
+                    yield audio
+            
+            # Surface LLM stream errors once the queued audio is out
+            await producer
+        
+        except Exception as e:
+            _error_log.error("Error generating sentence speech: %s", e)
+        
+        finally:
+            producer.cancel()
+            while not ordered.empty():
+                task = ordered.get_nowait()
+                if task is not None:
+                    pending.append(task)
+            for task in pending:
+                task.cancel()
+    
     @staticmethod
     def _sanitize_text_for_tts(text: str) -> str:
         """Sanitize text for TTS synthesis.
@@ -124,28 +266,7 @@ class SpeechProcessor:
         Returns:
             Sanitized text
         """
-        # Basic sanitization
-        sanitized = text.strip()
-        
-        # Expand common abbreviations for Indian context
-        replacements = {
-            "OTP": "O T P",
-            "KYC": "K Y C",
-            "PAN": "P A N",
-            "GST": "G S T",
-            "UPI": "U P I",
-            "NEFT": "N E F T",
-            "RTGS": "R T G S",
-            "IFSC": "I F S C",
-            "Rs.": "Rupees",
-            "₹": "Rupees",
-            "&": "and",
-        }
-        
-        for abbr, expansion in replacements.items():
-            sanitized = sanitized.replace(abbr, expansion)
-        
-        return sanitized
+        return _sanitize_text_for_tts(text)
     
     @staticmethod
     def get_audio_url_for_playback(audio_path: str, base_url: str) -> str:
@@ -158,8 +279,8 @@ class SpeechProcessor:
         Returns:
             Public URL for audio playback
         """
-        # Extract filename from path
-        filename = Path(audio_path).name
+        # Extract filename from path (no PurePath allocation on the hot path)
+        filename = os.path.basename(audio_path)
         
         # Construct public URL
         # Assumes audio files are served from /audio/ endpoint
@@ -190,3 +311,42 @@ async def generate_telephony_response(text: str, language: str = "en-IN") -> Opt
         Path to audio file
     """
     return await SpeechProcessor.generate_speech(text, language, cache=True)
+
+
+# In-process cache for static prompts (welcome, follow-up): skips
+# sanitization, hashing and the disk-cache lookup on every turn
+_tts_cache: Dict[Tuple[str, str], str] = {}
+_tts_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+# Memoized paths point into the audio cache; forget them when it is cleared
+deepgram_tts.add_clear_listener(_tts_cache.clear)
+
+
+async def cached_telephony_response(text: str, language: str = "en-IN") -> Optional[str]:
+    """Generate speech for a static prompt once and reuse the audio path.
+    
+    Concurrent misses for the same prompt wait on a per-key lock so only
+    one synthesis runs. Failures are not cached.
+    
+    Args:
+        text: Prompt text
+        language: Language code
+        
+    Returns:
+        Path to audio file
+    """
+    key = (text, language)
+    
+    audio_path = _tts_cache.get(key)
+    if audio_path is not None:
+        return audio_path
+    
+    lock = _tts_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        audio_path = _tts_cache.get(key)
+        if audio_path is None:
+            audio_path = await generate_telephony_response(text, language)
+            if audio_path:
+                _tts_cache[key] = audio_path
+    
+    return audio_path
@@ -1,19 +1,108 @@
 """Speech-to-Text service using Deepgram."""
 
 import asyncio
+import json
 import logging
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, AsyncIterator, Tuple
 from deepgram import (
+    DeepgramApiError,
     DeepgramClient,
     DeepgramClientOptions,
+    DeepgramError,
     LiveTranscriptionEvents,
     LiveOptions,
 )
+import httpx
 
 from app.config import settings
+from app.utils.logger import ThrottledErrorLog
 
 logger = logging.getLogger(__name__)
 
+# Tracebacks are capped so a Deepgram outage doesn't flood the log
+_error_log = ThrottledErrorLog(logger)
+
+# Failures expected from the Deepgram APIs and the network
+_STT_ERRORS = (DeepgramError, DeepgramApiError, httpx.HTTPError, asyncio.TimeoutError, OSError)
+
+
+class _FastJson:
+    """Stand-in for the json module: orjson loads, stdlib for everything else.
+    
+    dumps stays stdlib because control messages must go out as str frames.
+    """
+    
+    def __init__(self, loads: Callable[[Any], Any]):
+        """Initialize stand-in.
+        
+        Args:
+            loads: Fast JSON parser
+        """
+        self.loads = loads
+    
+    def __getattr__(self, name: str) -> Any:
+        """Delegate anything else (dumps, JSONDecodeError, ...) to json."""
+        return getattr(json, name)
+
+
+# The live client json.loads() every frame (interims ~every 100ms per call)
+# just to read its type. Route that parse through orjson - only if the SDK
+# module is where we expect and still uses the stdlib json global.
+try:
+    import orjson
+    from deepgram.clients.listen.v1.websocket import async_client as _live_client
+except ImportError as e:
+    logger.debug("Deepgram live frames parsed with stdlib json: %s", e)
+else:
+    if getattr(_live_client, "json", None) is json:
+        _live_client.json = _FastJson(orjson.loads)
+    else:
+        logger.debug("Deepgram live client has no stdlib json global; orjson patch skipped")
+
+# Idle live connections kept per option set. Options are fixed when a
+# connection opens, so calls only share sockets with identical settings.
+# The client's keepalive option pings idle sockets so Deepgram keeps them.
+STT_POOL_SIZE = 4
+
+# Max seconds stop_stream waits for Deepgram to flush after Finalize
+_FINALIZE_TIMEOUT = 2.0
+_stt_pools: Dict[Tuple, asyncio.Queue] = {}
+
+
+class _PooledConnection:
+    """Live Deepgram connection that routes events to its current owner."""
+    
+    __slots__ = ("connection", "owner")
+    
+    def __init__(self, connection, owner: "DeepgramSTT"):
+        """Wrap a live connection and register its event handlers once.
+        
+        Args:
+            connection: Deepgram async live client
+            owner: Stream that receives events
+        """
+        self.connection = connection
+        self.owner = owner
+        
+        connection.on(LiveTranscriptionEvents.Open, self._route("_on_open"))
+        connection.on(LiveTranscriptionEvents.Transcript, self._route("_on_transcript"))
+        connection.on(LiveTranscriptionEvents.Error, self._route("_on_error"))
+        connection.on(LiveTranscriptionEvents.Close, self._route("_on_close"))
+    
+    def _route(self, handler_name: str):
+        """Build an SDK event handler that forwards to the owner.
+        
+        Args:
+            handler_name: DeepgramSTT handler method name
+        
+        Returns:
+            Async handler (the SDK schedules handlers as tasks)
+        """
+        async def handler(_client, *args, **kwargs):
+            getattr(self.owner, handler_name)(*args, **kwargs)
+        return handler
+
+
 
 class DeepgramSTT:
     """Async streaming Speech-to-Text using Deepgram WebSocket API.
@@ -54,19 +143,51 @@ class DeepgramSTT:
         # Connection state
         self.connection = None
         self.is_connected = False
+        self._pooled: Optional[_PooledConnection] = None
+        
+        # Transcripts are queued for final_transcripts()/interim_transcripts()
+        # so consumer work never runs inside the SDK's receive loop
+        self._final_queue: asyncio.Queue = asyncio.Queue()
+        self._interim_queue: asyncio.Queue = asyncio.Queue()
+        self._finalized = asyncio.Event()
         
         # Callbacks
-        self.on_interim_transcript: Optional[Callable[[str], None]] = None
-        self.on_final_transcript: Optional[Callable[[str], None]] = None
         self.on_error: Optional[Callable[[str], None]] = None
     
+    @property
+    def _pool_key(self) -> Tuple:
+        """Options that must match for two streams to share a connection."""
+        return (self.model, self.language, self.encoding, self.sample_rate, self.channels)
+    
     async def start_stream(self) -> bool:
         """Start streaming connection to Deepgram.
         
+        Reuses an idle pooled connection with the same options when one is
+        still open, skipping the WebSocket + TLS handshake.
+        
         Returns:
             True if connection successful, False otherwise
         """
         try:
+            # Fresh queues so a previous stream's end marker doesn't leak in
+            self._final_queue = asyncio.Queue()
+            self._interim_queue = asyncio.Queue()
+            
+            pool = _stt_pools.setdefault(self._pool_key, asyncio.Queue(maxsize=STT_POOL_SIZE))
+            
+            while not pool.empty():
+                pooled = pool.get_nowait()
+                if await pooled.connection.is_connected():
+                    pooled.owner = self
+                    self._pooled = pooled
+                    self.connection = pooled.connection
+                    self.is_connected = True
+                    logger.info("Deepgram STT stream reused from pool: %s, %s, %sHz", self.language, self.encoding, self.sample_rate)
+                    return True
+                
+                # Closed while idle (e.g. server timeout) - drop it
+                await self._finish_connection(pooled.connection)
+            
             # Configure live transcription options
             options = LiveOptions(
                 model=self.model,
@@ -80,25 +201,21 @@ class DeepgramSTT:
                 utterance_end_ms=1000,
             )
             
-            # Create live transcription connection
-            self.connection = self.client.listen.asynclive.v("1")
-            
-            # Register event handlers
-            self.connection.on(LiveTranscriptionEvents.Open, self._on_open)
-            self.connection.on(LiveTranscriptionEvents.Transcript, self._on_transcript)
-            self.connection.on(LiveTranscriptionEvents.Error, self._on_error)
-            self.connection.on(LiveTranscriptionEvents.Close, self._on_close)
+            # Create live transcription connection (event handlers registered once)
+            pooled = _PooledConnection(self.client.listen.asynclive.v("1"), self)
             
             # Start connection
-            if await self.connection.start(options):
-                logger.info(f"Deepgram STT stream started: {self.language}, {self.encoding}, {self.sample_rate}Hz")
+            if await pooled.connection.start(options):
+                self._pooled = pooled
+                self.connection = pooled.connection
+                logger.info("Deepgram STT stream started: %s, %s, %sHz", self.language, self.encoding, self.sample_rate)
                 return True
             else:
                 logger.error("Failed to start Deepgram STT stream")
                 return False
-                
-        except Exception as e:
-            logger.error(f"Error starting Deepgram STT stream: {str(e)}", exc_info=True)
+        
+        except _STT_ERRORS as e:
+            _error_log.error("Error starting Deepgram STT stream: %s", e)
             return False
     
     async def send_audio(self, audio_chunk: bytes):
@@ -109,21 +226,82 @@ class DeepgramSTT:
         """
         if self.connection and self.is_connected:
             try:
-                self.connection.send(audio_chunk)
-            except Exception as e:
-                logger.error(f"Error sending audio to Deepgram: {str(e)}")
+                await self.connection.send(audio_chunk)
+            except _STT_ERRORS as e:
+                logger.error("Error sending audio to Deepgram: %s", e)
     
     async def stop_stream(self):
-        """Stop streaming connection."""
-        if self.connection:
+        """Stop streaming and return the connection to the pool.
+        
+        Buffered audio is finalized first so this call's last transcripts
+        are still delivered. The connection is closed instead if it has
+        dropped or the pool is full.
+        """
+        pooled = self._pooled
+        if pooled:
             try:
-                await self.connection.finish()
-                logger.info("Deepgram STT stream stopped")
-            except Exception as e:
-                logger.error(f"Error stopping Deepgram STT stream: {str(e)}")
+                self._finalized.clear()
+                if await pooled.connection.finalize():
+                    try:
+                        await asyncio.wait_for(self._finalized.wait(), _FINALIZE_TIMEOUT)
+                    except asyncio.TimeoutError:
+                        logger.warning("Timed out waiting for Deepgram finalize")
+                
+                pool = _stt_pools.get(self._pool_key)
+                if pool is not None and not pool.full() and await pooled.connection.is_connected():
+                    pool.put_nowait(pooled)
+                    logger.info("Deepgram STT stream returned to pool")
+                else:
+                    await pooled.connection.finish()
+                    logger.info("Deepgram STT stream stopped")
+            except _STT_ERRORS as e:
+                logger.error("Error stopping Deepgram STT stream: %s", e)
             finally:
                 self.is_connected = False
                 self.connection = None
+                self._pooled = None
+                
+                # End marker for transcript consumers
+                self._final_queue.put_nowait(None)
+                self._interim_queue.put_nowait(None)
+    
+    async def final_transcripts(self) -> AsyncIterator[str]:
+        """Yield final transcripts until the stream is stopped.
+        
+        Yields:
+            Final transcript text
+        """
+        queue = self._final_queue
+        while True:
+            transcript = await queue.get()
+            if transcript is None:
+                return
+            yield transcript
+    
+    async def interim_transcripts(self) -> AsyncIterator[str]:
+        """Yield interim transcripts until the stream is stopped.
+        
+        Yields:
+            Interim transcript text
+        """
+        queue = self._interim_queue
+        while True:
+            transcript = await queue.get()
+            if transcript is None:
+                return
+            yield transcript
+    
+    @staticmethod
+    async def _finish_connection(connection):
+        """Close a live connection, ignoring errors.
+        
+        Args:
+            connection: Deepgram async live client
+        """
+        try:
+            await connection.finish()
+        except Exception as e:
+            logger.debug("Error closing pooled Deepgram connection: %s", e)
     
     def _on_open(self, *args, **kwargs):
         """Handle connection open event."""
@@ -137,6 +315,10 @@ class DeepgramSTT:
             if not result:
                 return
             
+            # Reply to our Finalize request - stop_stream can hand the socket back
+            if result.from_finalize:
+                self._finalized.set()
+            
             # Extract transcript
             channel = result.channel
             if not channel or not channel.alternatives:
@@ -152,21 +334,22 @@ class DeepgramSTT:
             is_final = result.is_final
             
             if is_final:
-                logger.info(f"Final transcript: {transcript}")
-                if self.on_final_transcript:
-                    self.on_final_transcript(transcript)
+                logger.info("Final transcript: %s", transcript)
+                self._final_queue.put_nowait(transcript)
             else:
-                logger.debug(f"Interim transcript: {transcript}")
-                if self.on_interim_transcript:
-                    self.on_interim_transcript(transcript)
-                    
+                # Interims arrive every ~100ms per call; skip the call entirely when off
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Interim transcript: %s", transcript)
+                self._interim_queue.put_nowait(transcript)
+        
         except Exception as e:
-            logger.error(f"Error processing transcript: {str(e)}", exc_info=True)
+            # Handler runs as a bare SDK task; nothing upstream would log this
+            _error_log.error("Error processing transcript: %s", e)
     
     def _on_error(self, *args, **kwargs):
         """Handle error event."""
         error = kwargs.get("error")
-        logger.error(f"Deepgram STT error: {error}")
+        logger.error("Deepgram STT error: %s", error)
         if self.on_error:
             self.on_error(str(error))
     
@@ -203,7 +386,7 @@ class DeepgramSTTSimple:
         
         Args:
             audio_url: URL to audio file
-            
+        
         Returns:
             Transcribed text or None if error
         """
@@ -226,13 +409,13 @@ class DeepgramSTTSimple:
                 channel = response.results.channels[0]
                 if channel.alternatives:
                     transcript = channel.alternatives[0].transcript
-                    logger.info(f"Transcribed URL: {transcript}")
+                    logger.info("Transcribed URL: %s", transcript)
                     return transcript
             
             return None
-            
-        except Exception as e:
-            logger.error(f"Error transcribing URL: {str(e)}", exc_info=True)
+        
+        except _STT_ERRORS as e:
+            _error_log.error("Error transcribing URL: %s", e)
             return None
     
     async def transcribe_file(self, audio_data: bytes) -> Optional[str]:
@@ -240,7 +423,7 @@ class DeepgramSTTSimple:
         
         Args:
             audio_data: Raw audio file bytes
-            
+        
         Returns:
             Transcribed text or None if error
         """
@@ -261,16 +444,24 @@ class DeepgramSTTSimple:
                 channel = response.results.channels[0]
                 if channel.alternatives:
                     transcript = channel.alternatives[0].transcript
-                    logger.info(f"Transcribed file: {transcript}")
+                    logger.info("Transcribed file: %s", transcript)
                     return transcript
             
             return None
-            
-        except Exception as e:
-            logger.error(f"Error transcribing file: {str(e)}", exc_info=True)
+        
+        except _STT_ERRORS as e:
+            _error_log.error("Error transcribing file: %s", e)
             return None
 
 
+async def close_stt_pool():
+    """Close all idle pooled live connections (call on shutdown)."""
+    for pool in _stt_pools.values():
+        while not pool.empty():
+            await DeepgramSTT._finish_connection(pool.get_nowait().connection)
+    _stt_pools.clear()
+
+
 # Global instances for convenience
 # Language can be changed per call by creating new instances
 deepgram_stt_simple = DeepgramSTTSimple(language="en-IN")
@@ -2,18 +2,33 @@
 
 import asyncio
 import logging
-from typing import Optional
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import AsyncIterator, Callable, Dict, List, Mapping, Optional, Set
 import httpx
 from pathlib import Path
-import hashlib
 import os
 
-from deepgram import DeepgramClient, SpeakOptions
+import aiofiles
+import aiofiles.os
+import xxhash
+from deepgram import DeepgramApiError, DeepgramClient, DeepgramError, SpeakOptions
 
 from app.config import settings
+from app.speech.tts_cache import create_remote_cache
+from app.utils.logger import ThrottledErrorLog
 
 logger = logging.getLogger(__name__)
 
+# Tracebacks are capped so a Deepgram outage doesn't flood the log
+_error_log = ThrottledErrorLog(logger)
+
+# Failures expected from the Speak API, the network and the cache directory
+_TTS_ERRORS = (DeepgramError, DeepgramApiError, httpx.HTTPError, asyncio.TimeoutError, OSError)
+
+# Recently served cache paths kept in memory so hot phrases skip the stat
+_HOT_CACHE_SIZE = 256
+
 
 class DeepgramTTS:
     """Async Text-to-Speech using Deepgram Speak API.
@@ -50,6 +65,23 @@ class DeepgramTTS:
         # Audio cache directory
         self.cache_dir = Path("audio_cache")
         self.cache_dir.mkdir(exist_ok=True)
+        
+        # cache_key -> audio path, LRU ordered
+        self._hot_cache: "OrderedDict[str, str]" = OrderedDict()
+        
+        # Callbacks that drop path memos held outside this instance
+        self._clear_listeners: List[Callable[[], None]] = []
+        
+        # Single-flight: concurrent misses for one cache_key share a request
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # Optional shared tier (S3) so replicas reuse each other's audio
+        self.remote_cache = create_remote_cache()
+        self._uploads: Set[asyncio.Task] = set()
+        
+        # Bound on in-flight Deepgram requests (rebuilt if the loop changes)
+        self._sem: Optional[asyncio.Semaphore] = None
+        self._sem_loop: Optional[asyncio.AbstractEventLoop] = None
     
     async def synthesize(
         self,
@@ -76,45 +108,212 @@ class DeepgramTTS:
             # Use override voice if provided
             voice = voice_override or self.voice
             
-            # Check cache
-            if cache:
-                cache_key = self._get_cache_key(text, voice)
-                cached_file = self.cache_dir / f"{cache_key}.{self.container}"
-                if cached_file.exists():
-                    logger.info(f"Using cached audio: {cached_file}")
-                    return str(cached_file)
-            
-            # Configure speak options
-            options = SpeakOptions(
-                model=voice,
-                encoding=self.encoding,
-                sample_rate=self.sample_rate,
-                container=self.container
-            )
+            if not cache:
+                return await self._synthesize_temp(text, self._speak_options(voice))
             
-            # Generate speech
-            logger.info(f"Generating TTS: '{text[:50]}...' with voice {voice}")
+            # Check cache: in-memory LRU first, then the audio_cache directory
+            cache_key = self._get_cache_key(text, voice)
             
-            response = await self.client.speak.asyncrest.v("1").save(
-                filename=str(cached_file) if cache else None,
-                source={"text": text},
-                options=options
-            )
+            hot_path = self._hot_cache.get(cache_key)
+            if hot_path is not None:
+                self._hot_cache.move_to_end(cache_key)
+                logger.debug("Using hot cached audio: %s", hot_path)
+                return hot_path
             
-            if cache and cached_file.exists():
-                logger.info(f"Audio generated and cached: {cached_file}")
-                return str(cached_file)
-            else:
-                # If not caching, save to temp file
-                temp_file = self.cache_dir / f"temp_{hashlib.md5(text.encode()).hexdigest()}.{self.container}"
-                # Response should contain audio data
-                logger.info(f"Audio generated: {temp_file}")
-                return str(temp_file)
+            # Another caller is already synthesizing this prompt - share its result
+            inflight = self._inflight.get(cache_key)
+            if inflight is not None:
+                return await asyncio.shield(inflight)
+            
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[cache_key] = future
+            audio_path = None
+            try:
+                audio_path = await self._synthesize_cached(text, voice, cache_key)
+            finally:
+                self._inflight.pop(cache_key, None)
+                # Failures resolve waiters with None (the leader logs the error)
+                future.set_result(audio_path)
+            
+            return audio_path
                 
+        except _TTS_ERRORS as e:
+            _error_log.error("Error generating TTS: %s", e)
+            return None
         except Exception as e:
-            logger.error(f"Error generating TTS: {str(e)}", exc_info=True)
+            # Public boundary: callers rely on None for any failure (SDK
+            # type errors, bad options), not only the expected ones above
+            _error_log.error("Unexpected error generating TTS: %s", e)
             return None
     
+    async def _synthesize_cached(
+        self,
+        text: str,
+        voice: str,
+        cache_key: str
+    ) -> str:
+        """Return the cached audio file for a prompt, generating it if missing.
+        
+        Args:
+            text: Text to synthesize
+            voice: Voice model
+            cache_key: Cache key for text and voice
+            
+        Returns:
+            Path to cached audio file
+        """
+        filename = f"{cache_key}.{self.container}"
+        cached_file = self.cache_dir / filename
+        if await aiofiles.os.path.exists(cached_file):
+            logger.info("Using cached audio: %s", cached_file)
+            return self._remember(cache_key, str(cached_file))
+        
+        # Another replica may already have synthesized this prompt
+        if self.remote_cache:
+            audio_data = await self.remote_cache.get(filename)
+            if audio_data:
+                async with aiofiles.open(cached_file, "wb") as out:
+                    await out.write(audio_data)
+                logger.info("Using remote cached audio: %s", cached_file)
+                return self._remember(cache_key, str(cached_file))
+        
+        # Generate speech
+        logger.info("Generating TTS: '%s...' with voice %s", text[:50], voice)
+        
+        # SDK writes the file with aiofiles and raises on failure
+        async with self._semaphore():
+            await self.client.speak.asyncrest.v("1").save(
+                filename=str(cached_file),
+                source={"text": text},
+                options=self._speak_options(voice)
+            )
+        
+        logger.info("Audio generated and cached: %s", cached_file)
+        
+        if self.remote_cache:
+            # Upload off the response path; keep a reference so it isn't GC'd
+            task = asyncio.create_task(self._upload(filename, cached_file))
+            self._uploads.add(task)
+            task.add_done_callback(self._uploads.discard)
+        
+        return self._remember(cache_key, str(cached_file))
+    
+    async def _upload(self, filename: str, path: Path):
+        """Copy a cached audio file to the remote tier.
+        
+        Args:
+            filename: Cache filename (remote key)
+            path: Local file path
+        """
+        try:
+            async with aiofiles.open(path, "rb") as f:
+                await self.remote_cache.put(filename, await f.read())
+        except OSError as e:
+            logger.error("Error uploading cached audio: %s", e)
+    
+    async def close(self):
+        """Wait for pending uploads and close the remote cache tier."""
+        if self._uploads:
+            await asyncio.gather(*self._uploads, return_exceptions=True)
+        if self.remote_cache:
+            await self.remote_cache.close()
+    
+    async def _synthesize_temp(self, text: str, options: SpeakOptions) -> str:
+        """Generate audio into an uncached temp file.
+        
+        Args:
+            text: Text to synthesize
+            options: Speak options
+            
+        Returns:
+            Path to temp audio file
+        """
+        logger.info("Generating TTS: '%s...' with voice %s", text[:50], options.model)
+        
+        temp_file = self.cache_dir / f"temp_{xxhash.xxh3_128_hexdigest(text)}.{self.container}"
+        async with self._semaphore():
+            response = await self._open_stream(text, options)
+            try:
+                async with aiofiles.open(temp_file, "wb") as out:
+                    async for chunk in response.aiter_bytes():
+                        await out.write(chunk)
+            finally:
+                await response.aclose()
+        
+        logger.info("Audio generated: %s", temp_file)
+        return str(temp_file)
+    
+    def _speak_options(self, voice: str) -> SpeakOptions:
+        """Build Deepgram speak options for a voice.
+        
+        Args:
+            voice: Voice model
+            
+        Returns:
+            Speak options with this instance's encoding settings
+        """
+        return SpeakOptions(
+            model=voice,
+            encoding=self.encoding,
+            sample_rate=self.sample_rate,
+            container=self.container
+        )
+    
+    def _semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore for the running event loop.
+        
+        Returns:
+            Semaphore sized by TTS_MAX_CONCURRENCY
+        """
+        loop = asyncio.get_running_loop()
+        if self._sem is None or self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(settings.TTS_MAX_CONCURRENCY)
+            self._sem_loop = loop
+        return self._sem
+    
+    async def synthesize_chunks(
+        self,
+        text: str,
+        voice_override: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """Synthesize speech and yield audio chunks as Deepgram sends them.
+        
+        Lets callers forward audio to the telephony sink before synthesis
+        finishes. Errors are logged and end the stream early.
+        
+        Args:
+            text: Text to synthesize
+            voice_override: Override default voice
+            
+        Yields:
+            Audio byte chunks
+        """
+        if not text or not text.strip():
+            return
+        
+        options = self._speak_options(voice_override or self.voice)
+        
+        logger.info("Generating streaming TTS: '%s...'", text[:50])
+        
+        # Slot is held for the whole stream, including while the caller consumes it
+        async with self._semaphore():
+            try:
+                response = await self._open_stream(text, options)
+            except _TTS_ERRORS as e:
+                _error_log.error("Error generating streaming TTS: %s", e)
+                return
+            except Exception as e:
+                _error_log.error("Unexpected error generating streaming TTS: %s", e)
+                return
+            
+            try:
+                async for chunk in response.aiter_bytes():
+                    yield chunk
+            except httpx.HTTPError as e:
+                _error_log.error("Error streaming TTS audio: %s", e)
+            finally:
+                await response.aclose()
+    
     async def synthesize_streaming(
         self,
         text: str,
@@ -129,37 +328,51 @@ class DeepgramTTS:
         Returns:
             Audio bytes or None if error
         """
-        try:
-            if not text or not text.strip():
-                return None
-            
-            voice = voice_override or self.voice
-            
-            options = SpeakOptions(
-                model=voice,
-                encoding=self.encoding,
-                sample_rate=self.sample_rate,
-                container=self.container
-            )
-            
-            logger.info(f"Generating streaming TTS: '{text[:50]}...'")
-            
-            response = await self.client.speak.asyncrest.v("1").stream(
-                source={"text": text},
-                options=options
-            )
+        audio_data = b"".join([chunk async for chunk in self.synthesize_chunks(text, voice_override)])
+        if not audio_data:
+            return None
+        
+        logger.info("Streaming TTS generated: %s bytes", len(audio_data))
+        return audio_data
+    
+    async def _open_stream(self, text: str, options: SpeakOptions) -> httpx.Response:
+        """Start a Deepgram speak request and return the unread response.
+        
+        Args:
+            text: Text to synthesize
+            options: Speak options
             
-            # Collect audio chunks
-            audio_data = b""
-            async for chunk in response:
-                audio_data += chunk
+        Returns:
+            Streaming httpx response (caller must aclose it)
             
-            logger.info(f"Streaming TTS generated: {len(audio_data)} bytes")
-            return audio_data
+        Raises:
+            httpx.HTTPStatusError: If Deepgram rejects the request
+        """
+        response = await self.client.speak.asyncrest.v("1").stream_raw(
+            source={"text": text},
+            options=options
+        )
+        if response.is_error:
+            await response.aread()
+            await response.aclose()
+            response.raise_for_status()
+        return response
+    
+    def _remember(self, cache_key: str, path: str) -> str:
+        """Record a cache path in the hot LRU, evicting the oldest entry.
+        
+        Args:
+            cache_key: Cache key
+            path: Audio file path
             
-        except Exception as e:
-            logger.error(f"Error generating streaming TTS: {str(e)}", exc_info=True)
-            return None
+        Returns:
+            The path
+        """
+        self._hot_cache[cache_key] = path
+        self._hot_cache.move_to_end(cache_key)
+        if len(self._hot_cache) > _HOT_CACHE_SIZE:
+            self._hot_cache.popitem(last=False)
+        return path
     
     def _get_cache_key(self, text: str, voice: str) -> str:
         """Generate cache key for text and voice combination.
@@ -172,17 +385,34 @@ class DeepgramTTS:
             Cache key (hash)
         """
         content = f"{text}_{voice}_{self.encoding}_{self.sample_rate}"
-        return hashlib.md5(content.encode()).hexdigest()
+        # Filename key only - no cryptographic property needed
+        return xxhash.xxh3_128_hexdigest(content)
+    
+    def add_clear_listener(self, callback: Callable[[], None]):
+        """Register a callback fired when the audio cache is cleared.
+        
+        Args:
+            callback: Called with no arguments after the in-memory caches
+                are dropped, before files are deleted
+        """
+        self._clear_listeners.append(callback)
     
     def clear_cache(self):
         """Clear audio cache directory."""
+        self._hot_cache.clear()
+        for callback in self._clear_listeners:
+            try:
+                callback()
+            except Exception as e:
+                logger.error("TTS cache clear listener failed: %s", e)
+        
         try:
             for file in self.cache_dir.glob("*"):
                 if file.is_file():
                     file.unlink()
             logger.info("Audio cache cleared")
         except Exception as e:
-            logger.error(f"Error clearing cache: {str(e)}")
+            logger.error("Error clearing cache: %s", e)
 
 
 class TTSVoiceConfig:
@@ -211,15 +441,16 @@ class TTSVoiceConfig:
         Returns:
             Voice model name
         """
-        # Map language codes to voices
-        voice_map = {
-            "en-IN": cls.ENGLISH_NEUTRAL,
-            "en-US": cls.ENGLISH_PROFESSIONAL,
-            "en-GB": cls.ENGLISH_WARM,
-            # Add more mappings as voices become available
-        }
-        
-        return voice_map.get(language, cls.ENGLISH_NEUTRAL)
+        return _VOICE_MAP.get(language, cls.ENGLISH_NEUTRAL)
+
+
+# Map language codes to voices (built once at import)
+_VOICE_MAP: Mapping[str, str] = MappingProxyType({
+    "en-IN": TTSVoiceConfig.ENGLISH_NEUTRAL,
+    "en-US": TTSVoiceConfig.ENGLISH_PROFESSIONAL,
+    "en-GB": TTSVoiceConfig.ENGLISH_WARM,
+    # Add more mappings as voices become available
+})
 
 
 # Global instance for convenience
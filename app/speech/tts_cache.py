@@ -0,0 +1,123 @@
+"""Shared remote tier for the TTS audio cache.
+
+Local disk stays the first tier inside DeepgramTTS. A remote object store
+lets horizontally scaled replicas reuse each other's synthesized prompts
+instead of each calling Deepgram for the same text.
+"""
+
+import logging
+from contextlib import AsyncExitStack
+from typing import Optional, Protocol
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# S3 support is optional (pip install aiobotocore)
+try:
+    from aiobotocore.session import get_session
+except ImportError:
+    get_session = None
+
+
+class CacheBackend(Protocol):
+    """Byte store keyed by TTS cache filename."""
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        """Fetch cached audio, or None on miss."""
+        ...
+    
+    async def put(self, key: str, data: bytes) -> None:
+        """Store audio under key."""
+        ...
+    
+    async def close(self) -> None:
+        """Release connections."""
+        ...
+
+
+class S3Cache:
+    """TTS cache tier backed by an S3-compatible bucket."""
+    
+    def __init__(self, bucket: str, prefix: str = "tts-cache/"):
+        """Initialize S3 cache.
+        
+        Args:
+            bucket: Bucket name
+            prefix: Key prefix for cache objects
+        """
+        self.bucket = bucket
+        self.prefix = prefix
+        
+        # Client is opened on first use and kept for connection reuse
+        self._stack: Optional[AsyncExitStack] = None
+        self._client = None
+    
+    async def _get_client(self):
+        """Get the shared S3 client, creating it if needed.
+        
+        Returns:
+            aiobotocore S3 client
+        """
+        if self._client is None:
+            self._stack = AsyncExitStack()
+            self._client = await self._stack.enter_async_context(
+                get_session().create_client("s3")
+            )
+        return self._client
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        """Fetch cached audio from the bucket.
+        
+        Args:
+            key: Cache filename
+        
+        Returns:
+            Audio bytes or None on miss/error
+        """
+        try:
+            client = await self._get_client()
+            response = await client.get_object(Bucket=self.bucket, Key=self.prefix + key)
+            async with response["Body"] as stream:
+                return await stream.read()
+        except Exception as e:
+            # NoSuchKey is the normal miss path
+            logger.debug("S3 cache miss for %s: %s", key, e)
+            return None
+    
+    async def put(self, key: str, data: bytes) -> None:
+        """Upload audio to the bucket.
+        
+        Args:
+            key: Cache filename
+            data: Audio bytes
+        """
+        try:
+            client = await self._get_client()
+            await client.put_object(Bucket=self.bucket, Key=self.prefix + key, Body=data)
+        except Exception as e:
+            logger.error("Error uploading TTS audio to S3: %s", e)
+    
+    async def close(self) -> None:
+        """Close the S3 client."""
+        if self._stack is not None:
+            await self._stack.aclose()
+            self._stack = None
+            self._client = None
+
+
+def create_remote_cache() -> Optional[CacheBackend]:
+    """Build the remote cache tier from settings.
+    
+    Returns:
+        Configured backend, or None if no bucket is set or aiobotocore
+        is not installed
+    """
+    if not settings.TTS_CACHE_S3_BUCKET:
+        return None
+    
+    if get_session is None:
+        logger.warning("TTS_CACHE_S3_BUCKET is set but aiobotocore is not installed; remote TTS cache disabled")
+        return None
+    
+    return S3Cache(settings.TTS_CACHE_S3_BUCKET, settings.TTS_CACHE_S3_PREFIX)
@@ -0,0 +1,221 @@
+"""Batched CSV appends for call data files."""
+
+import atexit
+import csv
+import io
+import logging
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import IO, Any, Deque, Iterable, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Flush when this many rows are pending, or after the interval, whichever first
+_MAX_PENDING_ROWS = 256
+_FLUSH_INTERVAL = 0.5
+
+
+def create_csv(path: Path, headers: Sequence[str]) -> bool:
+    """Create a CSV file with its header row unless it already exists.
+    
+    Exclusive-create mode makes this one open() instead of a stat plus an
+    open, and concurrent workers can't both write the header.
+    
+    Args:
+        path: CSV file path
+        headers: Header row
+    
+    Returns:
+        True if the file was created
+    """
+    try:
+        with open(path, 'x', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerow(headers)
+    except FileExistsError:
+        return False
+    return True
+
+
+class BufferedCSVAppender:
+    """Append rows to a CSV file in batches from a background thread.
+    
+    Callers only append the row to a deque (atomic in CPython, no lock), so
+    saves never wait on formatting or I/O. A daemon thread per file drains
+    it, formats the batch to CSV text and writes it with one write/fsync to
+    a handle kept open between batches, so there is no open/close per row
+    and rows never interleave on disk. Readers of the file should call
+    flush(sync=False) first so they see every queued row without waiting
+    on a disk sync.
+    """
+    
+    def __init__(
+        self,
+        path: Path,
+        max_rows: int = _MAX_PENDING_ROWS,
+        interval: float = _FLUSH_INTERVAL
+    ):
+        """Initialize appender.
+        
+        Args:
+            path: CSV file to append to (header must already exist)
+            max_rows: Pending row count that triggers an immediate flush
+            interval: Max seconds a row waits before being written
+        """
+        self.path = path
+        self.max_rows = max_rows
+        self.interval = interval
+        
+        self._rows: Deque[Sequence[Any]] = deque()
+        self._start_lock = threading.Lock()  # Guards flush thread startup
+        self._write_lock = threading.Lock()  # Serializes draining and writes
+        self._sync_lock = threading.Lock()  # Keeps the handle open during fsync
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._file: Optional[IO[bytes]] = None  # Opened on first flush
+        self.bytes_written = 0  # Bytes this appender has added to the file
+        self._unwritten = b""  # Bytes a failed write didn't get into the file
+        
+        # Reused formatter (drain side only): csv quoting into memory
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+        
+        # Scripts exit without a shutdown hook; don't lose their last rows
+        atexit.register(self.close)
+    
+    def append(self, row: Sequence[Any]):
+        """Queue a row for writing.
+        
+        Args:
+            row: CSV row values (not modified after queuing)
+        """
+        self._rows.append(row)
+        
+        if self._closed:
+            # Late writer after shutdown: nothing would drain the queue
+            self._write_through()
+            return
+        if self._thread is None:
+            self._start_thread()
+        if len(self._rows) >= self.max_rows:
+            self._wake.set()
+    
+    def extend(self, rows: Iterable[Sequence[Any]]):
+        """Queue several rows for writing in one step.
+        
+        Args:
+            rows: CSV rows (not modified after queuing)
+        """
+        self._rows.extend(rows)
+        
+        if self._closed:
+            self._write_through()
+            return
+        if self._thread is None:
+            self._start_thread()
+        if len(self._rows) >= self.max_rows:
+            self._wake.set()
+    
+    def _start_thread(self):
+        """Start the flush thread on first use."""
+        with self._start_lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name=f"csv-flush-{self.path.name}",
+                    daemon=True
+                )
+                self._thread.start()
+    
+    def flush(self, sync: bool = True):
+        """Write all pending rows to the file.
+        
+        The fsync runs after _write_lock is released, so a reader flushing
+        concurrently never waits on the disk.
+        
+        Args:
+            sync: Also fsync the file so the rows are durable. Readers only
+                need the rows handed to the OS and pass False.
+        """
+        sync_file = None
+        with self._write_lock:
+            # Single consumer: only the holder of _write_lock pops rows
+            rows = self._rows
+            count = 0
+            while rows:
+                self._writer.writerow(rows.popleft())
+                count += 1
+            data = self._unwritten + self._buffer.getvalue().encode('utf-8')
+            self._buffer.seek(0)
+            self._buffer.truncate()
+            self._unwritten = b""
+            if not data:
+                return
+            
+            written = 0
+            try:
+                if self._file is None:
+                    # Unbuffered: each write() reports exactly what reached the file
+                    self._file = open(self.path, 'ab', buffering=0)
+                view = memoryview(data)
+                while written < len(data):
+                    written += self._file.write(view[written:])
+                if sync:
+                    sync_file = self._file
+            except OSError as e:
+                # Keep only the bytes that didn't land - a retry finishes a
+                # partly written row instead of duplicating whole rows
+                self._close_file()
+                self._unwritten = data[written:]
+                logger.error(
+                    "Error writing to %s (%d new rows, %d bytes pending): %s",
+                    self.path, count, len(self._unwritten), e
+                )
+            finally:
+                self.bytes_written += written
+        
+        if sync_file is not None:
+            # _close_file takes _sync_lock too, so the fd can't be closed
+            # (and reused) while it is being synced
+            with self._sync_lock:
+                if not sync_file.closed:
+                    try:
+                        os.fsync(sync_file.fileno())
+                    except OSError as e:
+                        # Rows are already in the file; only durability is in doubt
+                        logger.error("Error syncing %s: %s", self.path, e)
+    
+    def close(self):
+        """Stop the flush thread and write any remaining rows."""
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self.flush()
+        with self._write_lock:
+            self._close_file()
+    
+    def _write_through(self):
+        """Write queued rows synchronously after close() (no flush thread)."""
+        self.flush()
+        with self._write_lock:
+            self._close_file()
+    
+    def _close_file(self):
+        """Close the append handle, ignoring errors (caller holds _write_lock)."""
+        if self._file is not None:
+            with self._sync_lock:
+                try:
+                    self._file.close()
+                except OSError:
+                    pass
+            self._file = None
+    
+    def _run(self):
+        """Flush loop run on the background thread."""
+        while not self._closed:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
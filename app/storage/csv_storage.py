@@ -1,16 +1,22 @@
 """CSV storage for call data capture."""
 
 import csv
+import io
 import logging
+import threading
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Iterator, List, Optional
 from datetime import datetime
-import threading
 
+from app.storage.appender import BufferedCSVAppender, create_csv
 from app.storage.data_capture import MarketingCallData, NotificationCallData
 
 logger = logging.getLogger(__name__)
 
+# Export chunking: raw byte reads for full exports, row batches for filtered ones
+_EXPORT_CHUNK_SIZE = 64 * 1024
+_EXPORT_ROWS_PER_CHUNK = 500
+
 
 class CSVStorage:
     """Thread-safe CSV storage for call data.
@@ -30,93 +36,110 @@ class CSVStorage:
         self.marketing_file = self.data_dir / "marketing_calls.csv"
         self.notification_file = self.data_dir / "notification_calls.csv"
         
-        # Thread lock for safe concurrent writes
-        self._lock = threading.Lock()
+        # Callbacks fired after a marketing row is written (cache invalidation)
+        self._marketing_listeners: List[Callable[[MarketingCallData], None]] = []
         
         # Initialize CSV files with headers
         self._init_marketing_csv()
         self._init_notification_csv()
         
+        # Rows are batched and written off the request path
+        self._marketing_appender = BufferedCSVAppender(self.marketing_file)
+        self._notification_appender = BufferedCSVAppender(self.notification_file)
+        
         logger.info(f"CSV storage initialized: {self.data_dir}")
     
     def _init_marketing_csv(self):
         """Initialize marketing calls CSV with headers."""
-        if not self.marketing_file.exists():
-            headers = [
-                "call_id",
-                "campaign_id",
-                "campaign_name",
-                "user_interest",
-                "language",
-                "call_started_at",
-                "call_ended_at",
-                "call_duration_seconds",
-                "response_time_seconds",
-                "segment",
-                "objective",
-                "call_status",
-                "notes"
-            ]
-            
-            with open(self.marketing_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(headers)
-            
+        headers = [
+            "call_id",
+            "campaign_id",
+            "campaign_name",
+            "user_interest",
+            "language",
+            "call_started_at",
+            "call_ended_at",
+            "call_duration_seconds",
+            "response_time_seconds",
+            "segment",
+            "objective",
+            "call_status",
+            "notes"
+        ]
+        
+        if create_csv(self.marketing_file, headers):
             logger.info(f"Created marketing CSV: {self.marketing_file}")
     
     def _init_notification_csv(self):
         """Initialize notification calls CSV with headers."""
-        if not self.notification_file.exists():
-            headers = [
-                "call_id",
-                "notification_type",
-                "priority",
-                "delivered",
-                "acknowledged",
-                "call_started_at",
-                "call_ended_at",
-                "call_duration_seconds",
-                "language",
-                "call_status"
-            ]
-            
-            with open(self.notification_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(headers)
-            
+        headers = [
+            "call_id",
+            "notification_type",
+            "priority",
+            "delivered",
+            "acknowledged",
+            "call_started_at",
+            "call_ended_at",
+            "call_duration_seconds",
+            "language",
+            "call_status"
+        ]
+        
+        if create_csv(self.notification_file, headers):
             logger.info(f"Created notification CSV: {self.notification_file}")
     
+    def add_marketing_listener(self, callback: Callable[[MarketingCallData], None]):
+        """Register a callback fired after each marketing row is saved.
+        
+        Args:
+            callback: Called with the saved MarketingCallData
+        """
+        self._marketing_listeners.append(callback)
+    
+    def _notify_marketing_listeners(self, data: MarketingCallData):
+        """Notify marketing write listeners, isolating their failures.
+        
+        Args:
+            data: Saved MarketingCallData
+        """
+        for callback in self._marketing_listeners:
+            try:
+                callback(data)
+            except Exception as e:
+                logger.error(f"Marketing write listener failed: {str(e)}")
+    
     def save_marketing_call(self, data: MarketingCallData) -> bool:
         """Save marketing call data to CSV.
         
         Args:
             data: MarketingCallData instance
             
+        Returns:
+            True if saved successfully
+        """
+        return self.save_marketing_calls([data])
+    
+    def save_marketing_calls(self, records: List[MarketingCallData]) -> bool:
+        """Save several marketing calls to CSV in one batch.
+        
+        All rows are queued in one step. They reach the file on the flush
+        thread's next pass: after the flush interval, or sooner once the
+        appender's pending-row threshold is hit.
+        
+        Args:
+            records: MarketingCallData instances
+            
         Returns:
             True if saved successfully
         """
         try:
-            with self._lock:
-                with open(self.marketing_file, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow([
-                        data.call_id,
-                        data.campaign_id,
-                        data.campaign_name,
-                        data.user_interest,
-                        data.language,
-                        data.call_started_at.isoformat(),
-                        data.call_ended_at.isoformat() if data.call_ended_at else "",
-                        data.call_duration_seconds or "",
-                        data.response_time_seconds or "",
-                        data.segment or "",
-                        data.objective or "",
-                        data.call_status,
-                        data.notes or ""
-                    ])
-                
-                logger.info(f"Saved marketing call data: {data.call_id}")
-                return True
+            self._marketing_appender.extend([data.to_csv_row() for data in records])
+            
+            logger.info(f"Saved marketing call data: {', '.join(data.call_id for data in records)}")
+            
+            for data in records:
+                self._notify_marketing_listeners(data)
+            return True
                 
         except Exception as e:
             logger.error(f"Error saving marketing call data: {str(e)}", exc_info=True)
@@ -132,24 +155,10 @@ class CSVStorage:
             True if saved successfully
         """
         try:
-            with self._lock:
-                with open(self.notification_file, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow([
-                        data.call_id,
-                        data.notification_type,
-                        data.priority,
-                        data.delivered,
-                        data.acknowledged,
-                        data.call_started_at.isoformat(),
-                        data.call_ended_at.isoformat() if data.call_ended_at else "",
-                        data.call_duration_seconds or "",
-                        data.language,
-                        data.call_status
-                    ])
-                
-                logger.info(f"Saved notification call data: {data.call_id}")
-                return True
+            self._notification_appender.append(data.to_csv_row())
+            
+            logger.info(f"Saved notification call data: {data.call_id}")
+            return True
                 
         except Exception as e:
             logger.error(f"Error saving notification call data: {str(e)}", exc_info=True)
@@ -165,6 +174,7 @@ class CSVStorage:
             Dictionary with statistics
         """
         try:
+            self._marketing_appender.flush(sync=False)
             with open(self.marketing_file, 'r', encoding='utf-8') as f:
                 reader = csv.DictReader(f)
                 rows = list(reader)
@@ -192,6 +202,81 @@ class CSVStorage:
             logger.error(f"Error getting marketing stats: {str(e)}")
             return {"error": str(e)}
 
+    
+    def iter_marketing_csv(self, campaign_id: Optional[str] = None) -> Iterator[bytes]:
+        """Stream marketing call data as CSV bytes.
+        
+        Memory use is bounded regardless of file size. Without a filter the
+        file is streamed as-is; with a campaign filter the header is kept
+        and matching rows are re-encoded in batches.
+        
+        Args:
+            campaign_id: Optional campaign filter
+            
+        Yields:
+            CSV content chunks
+        """
+        self._marketing_appender.flush(sync=False)
+        
+        if not campaign_id:
+            with open(self.marketing_file, 'rb') as f:
+                while chunk := f.read(_EXPORT_CHUNK_SIZE):
+                    yield chunk
+            return
+        
+        with open(self.marketing_file, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            
+            campaign_col = header.index("campaign_id")
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(header)
+            pending = 0
+            
+            for row in reader:
+                if len(row) > campaign_col and row[campaign_col] == campaign_id:
+                    writer.writerow(row)
+                    pending += 1
+                    if pending >= _EXPORT_ROWS_PER_CHUNK:
+                        yield buffer.getvalue().encode('utf-8')
+                        buffer.seek(0)
+                        buffer.truncate()
+                        pending = 0
+            
+            yield buffer.getvalue().encode('utf-8')
+    
+    def flush(self):
+        """Write all queued rows to disk."""
+        self._marketing_appender.flush()
+        self._notification_appender.flush()
+    
+    def close(self):
+        """Flush queued rows and stop background writers."""
+        self._marketing_appender.close()
+        self._notification_appender.close()
+
+
+# Global storage instance, created on first use so importing this module
+# does no filesystem work
+_csv_storage: Optional[CSVStorage] = None
+_csv_storage_lock = threading.Lock()
+
 
-# Global storage instance
-csv_storage = CSVStorage()
+def get_csv_storage() -> CSVStorage:
+    """Get the global storage instance, creating it on first call.
+    
+    Creation is locked: BackgroundTasks call in from the threadpool, and a
+    second instance would start its own flush thread and atexit hook.
+    
+    Returns:
+        Shared CSVStorage
+    """
+    global _csv_storage
+    if _csv_storage is None:
+        with _csv_storage_lock:
+            if _csv_storage is None:
+                _csv_storage = CSVStorage()
+    return _csv_storage
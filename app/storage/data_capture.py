@@ -1,7 +1,7 @@
 """Data capture models and storage for marketing calls."""
 
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from pydantic import BaseModel, Field
 from enum import Enum
 
@@ -49,6 +49,28 @@ class MarketingCallData(BaseModel):
     
     class Config:
         use_enum_values = True
+    
+    def to_csv_row(self) -> Tuple[Any, ...]:
+        """Build the marketing_calls.csv row (column order matches the header).
+        
+        Returns:
+            Row values with None fields as empty strings
+        """
+        return (
+            self.call_id,
+            self.campaign_id,
+            self.campaign_name,
+            self.user_interest,
+            self.language,
+            self.call_started_at.isoformat(),
+            self.call_ended_at.isoformat() if self.call_ended_at else "",
+            self.call_duration_seconds or "",
+            self.response_time_seconds or "",
+            self.segment or "",
+            self.objective or "",
+            self.call_status,
+            self.notes or ""
+        )
 
 
 class NotificationCallData(BaseModel):
@@ -70,6 +92,31 @@ class NotificationCallData(BaseModel):
     
     class Config:
         use_enum_values = True
+    
+    def to_csv_row(self) -> Tuple[Any, ...]:
+        """Build the notification_calls.csv row (column order matches the header).
+        
+        Returns:
+            Row values with None fields as empty strings
+        """
+        return (
+            self.call_id,
+            self.notification_type,
+            self.priority,
+            self.delivered,
+            self.acknowledged,
+            self.call_started_at.isoformat(),
+            self.call_ended_at.isoformat() if self.call_ended_at else "",
+            self.call_duration_seconds or "",
+            self.language,
+            self.call_status
+        )
+
+
+# Interest keywords, checked in order (substring match on lowered text)
+_YES_KEYWORDS = ("yes", "yeah", "sure", "okay", "ok", "interested", "definitely", "absolutely")
+_NO_KEYWORDS = ("no", "nope", "not interested", "don't", "never", "not now")
+_MAYBE_KEYWORDS = ("maybe", "perhaps", "might", "think about", "consider", "later")
 
 
 def extract_user_interest(user_response: str) -> UserInterest:
@@ -87,18 +134,15 @@ def extract_user_interest(user_response: str) -> UserInterest:
     response_lower = user_response.lower().strip()
     
     # Yes indicators
-    yes_keywords = ["yes", "yeah", "sure", "okay", "ok", "interested", "definitely", "absolutely"]
-    if any(keyword in response_lower for keyword in yes_keywords):
+    if any(keyword in response_lower for keyword in _YES_KEYWORDS):
         return UserInterest.YES
     
     # No indicators
-    no_keywords = ["no", "nope", "not interested", "don't", "never", "not now"]
-    if any(keyword in response_lower for keyword in no_keywords):
+    if any(keyword in response_lower for keyword in _NO_KEYWORDS):
         return UserInterest.NO
     
     # Maybe indicators
-    maybe_keywords = ["maybe", "perhaps", "might", "think about", "consider", "later"]
-    if any(keyword in response_lower for keyword in maybe_keywords):
+    if any(keyword in response_lower for keyword in _MAYBE_KEYWORDS):
         return UserInterest.MAYBE
     
     # Default to unsure
@@ -1,7 +1,9 @@
 """Call metrics tracking models."""
 
+import functools
+import hashlib
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional, Tuple
 from pydantic import BaseModel, Field
 from enum import Enum
 
@@ -61,6 +63,39 @@ class CallMetrics(BaseModel):
     
     class Config:
         use_enum_values = True
+    
+    def to_csv_row(self) -> Tuple[Any, ...]:
+        """Build the call_metrics.csv row (column order matches the header).
+        
+        Returns:
+            Row values with None fields as empty strings
+        """
+        return (
+            self.call_id,
+            self.vobiz_call_sid or "",
+            self.direction,
+            self.call_type,
+            self.from_number_hash or "",
+            self.to_number_hash or "",
+            self.call_started_at.isoformat(),
+            self.call_answered_at.isoformat() if self.call_answered_at else "",
+            self.call_ended_at.isoformat() if self.call_ended_at else "",
+            self.ring_duration or "",
+            self.talk_duration or "",
+            self.total_duration or "",
+            self.call_status,
+            self.disconnect_reason or "",
+            self.call_cost or "",
+            self.currency,
+            self.audio_quality or "",
+            self.transcript_available,
+            self.campaign_id or "",
+            self.agent_persona or "",
+            self.user_turns,
+            self.agent_turns,
+            self.language,
+            self.notes or ""
+        )
 
 
 class DailyMetricsSummary(BaseModel):
@@ -123,10 +158,16 @@ def calculate_call_metrics(session_data: dict) -> CallMetrics:
     if started_at and ended_at:
         total_duration = int((ended_at - started_at).total_seconds())
     
-    # Count conversation turns
+    # Count conversation turns in one pass
     conversation_history = session_data.get('conversation_history', [])
-    user_turns = len([t for t in conversation_history if t.get('role') == 'user'])
-    agent_turns = len([t for t in conversation_history if t.get('role') == 'assistant'])
+    user_turns = 0
+    agent_turns = 0
+    for turn in conversation_history:
+        role = turn.get('role')
+        if role == 'user':
+            user_turns += 1
+        elif role == 'assistant':
+            agent_turns += 1
     
     # Create metrics
     return CallMetrics(
@@ -145,10 +186,12 @@ def calculate_call_metrics(session_data: dict) -> CallMetrics:
         user_turns=user_turns,
         agent_turns=agent_turns,
         language=session_data.get('language', 'en-IN'),
-        transcript_available=len(conversation_history) > 0
+        transcript_available=bool(conversation_history)
     )
 
 
+# Numbers repeat across a call's metric writes
+@functools.lru_cache(maxsize=65536)
 def hash_phone_number(phone_number: str) -> str:
     """Hash phone number for privacy.
     
@@ -158,15 +201,14 @@ def hash_phone_number(phone_number: str) -> str:
     Returns:
         Hashed phone number (last 4 digits visible)
     """
-    import hashlib
-    
     if not phone_number:
         return ""
     
     # Keep last 4 digits, hash the rest
     if len(phone_number) > 4:
         visible = phone_number[-4:]
-        hashed = hashlib.md5(phone_number[:-4].encode()).hexdigest()[:8]
+        # 4-byte BLAKE2b digest keeps the 8 hex char format (faster than MD5)
+        hashed = hashlib.blake2b(phone_number[:-4].encode(), digest_size=4).hexdigest()
         return f"***{visible} ({hashed})"
     
     return phone_number
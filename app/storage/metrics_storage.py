@@ -2,16 +2,187 @@
 
 import csv
 import logging
+import os
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime, date
 from collections import defaultdict
 import threading
 
+from cachetools import LRUCache
+
+from app.storage.appender import BufferedCSVAppender, create_csv
 from app.storage.metrics import CallMetrics, DailyMetricsSummary
 
 logger = logging.getLogger(__name__)
 
+# Vectorized daily summaries are optional (pip install pyarrow); without it
+# the CSV is folded row by row in Python
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None
+
+# Columns and types read by the Arrow daily summary
+_SUMMARY_COLUMN_TYPES = {
+    "call_started_at": "string",
+    "direction": "string",
+    "call_type": "string",
+    "call_status": "string",
+    "talk_duration": "int64",
+    "call_cost": "float64",
+    "user_turns": "int64",
+    "transcript_available": "bool",
+}
+
+# Days whose running totals are kept in memory (today plus recent lookups)
+_CACHED_DAYS = 31
+
+# Metrics file as seen by a scan: (st_size, st_mtime_ns, bytes written by
+# this process's appender)
+_FileState = Tuple[int, int, int]
+
+
+def _unchanged_since(scanned: _FileState, current: _FileState) -> bool:
+    """Check that the metrics file only gained this process's own rows.
+    
+    Rows saved in-process are already added to the running totals, so the
+    totals stay valid while every byte appended since the scan came from
+    our appender. Rows from other workers or tools change the size (or the
+    mtime, when we wrote nothing) and force a rescan.
+    
+    Args:
+        scanned: File state when the totals were scanned
+        current: File state now
+        
+    Returns:
+        True if the cached totals still match the file
+    """
+    size, mtime_ns, written = current
+    scan_size, scan_mtime_ns, scan_written = scanned
+    if written == scan_written:
+        return size == scan_size and mtime_ns == scan_mtime_ns
+    return size == scan_size + (written - scan_written)
+
+
+class _DayTotals:
+    """Running aggregates for one day of call metrics rows."""
+    
+    __slots__ = (
+        "calls", "talk_duration", "cost", "user_turns", "transcripts",
+        "directions", "call_types", "statuses", "file_state",
+    )
+    
+    def __init__(self):
+        """Start with empty totals."""
+        self.calls = 0
+        self.talk_duration = 0
+        self.cost = 0.0
+        self.user_turns = 0
+        self.transcripts = 0
+        self.directions: Dict[str, int] = defaultdict(int)
+        self.call_types: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, int] = defaultdict(int)
+        self.file_state: Optional[_FileState] = None  # Set after the scan
+    
+    def add(self, metrics: CallMetrics):
+        """Fold one saved row in (same rules as the CSV scan).
+        
+        Args:
+            metrics: Saved CallMetrics
+        """
+        self.calls += 1
+        self.directions[metrics.direction] += 1
+        self.call_types[metrics.call_type] += 1
+        self.statuses[metrics.call_status] += 1
+        self.talk_duration += metrics.talk_duration or 0
+        self.cost += metrics.call_cost or 0.0
+        self.user_turns += metrics.user_turns or 0
+        if metrics.transcript_available:
+            self.transcripts += 1
+    
+    def to_summary(self, date_str: str) -> DailyMetricsSummary:
+        """Build the dashboard summary from the totals.
+        
+        Args:
+            date_str: Date (YYYY-MM-DD)
+        
+        Returns:
+            DailyMetricsSummary instance
+        """
+        summary = DailyMetricsSummary(date=date_str)
+        total_calls = self.calls
+        if not total_calls:
+            return summary
+        
+        summary.total_calls = total_calls
+        summary.inbound_calls = self.directions['inbound']
+        summary.outbound_calls = total_calls - self.directions['inbound']
+        summary.marketing_calls = self.call_types['marketing']
+        summary.notification_calls = self.call_types['notification']
+        summary.customer_service_calls = self.call_types['customer_service']
+        summary.completed_calls = self.statuses['completed']
+        summary.failed_calls = self.statuses['failed']
+        summary.no_answer_calls = self.statuses['no_answer']
+        
+        # Calculate averages
+        summary.total_talk_duration = self.talk_duration
+        summary.avg_talk_duration = self.talk_duration / total_calls
+        summary.avg_user_turns = self.user_turns / total_calls
+        summary.transcript_coverage = (self.transcripts / total_calls) * 100
+        
+        summary.total_cost = self.cost
+        summary.avg_cost_per_call = self.cost / total_calls
+        
+        return summary
+
+
+class _OverviewTotals:
+    """Running aggregates across all call metrics rows."""
+    
+    __slots__ = ("calls", "completed", "duration", "cost", "file_state")
+    
+    def __init__(self):
+        """Start with empty totals."""
+        self.calls = 0
+        self.completed = 0
+        self.duration = 0
+        self.cost = 0.0
+        self.file_state: Optional[_FileState] = None  # Set after the scan
+    
+    def add(self, metrics: CallMetrics):
+        """Fold one saved row in (same rules as the CSV scan).
+        
+        Args:
+            metrics: Saved CallMetrics
+        """
+        self.calls += 1
+        if metrics.call_status == 'completed':
+            self.completed += 1
+        self.duration += metrics.total_duration or 0
+        self.cost += metrics.call_cost or 0.0
+    
+    def to_dict(self) -> Dict:
+        """Build the overview response.
+        
+        Returns:
+            Dictionary with overview statistics
+        """
+        total_calls = self.calls
+        if not total_calls:
+            return {"total_calls": 0}
+        
+        return {
+            "total_calls": total_calls,
+            "completed_calls": self.completed,
+            "completion_rate": self.completed / total_calls * 100,
+            "total_duration_minutes": self.duration / 60,
+            "total_cost": self.cost,
+            "avg_cost_per_call": self.cost / total_calls
+        }
+
 
 class MetricsStorage:
     """Storage and aggregation for call metrics.
@@ -35,74 +206,76 @@ class MetricsStorage:
         # Thread lock for safe concurrent writes
         self._lock = threading.Lock()
         
+        # Per-day running totals so dashboard polls don't rescan the CSV.
+        # A day is scanned on first request, then updated on each save, and
+        # rescanned once another writer has changed the file.
+        self._day_totals: LRUCache = LRUCache(maxsize=_CACHED_DAYS)
+        self._overview: Optional[_OverviewTotals] = None  # Same, for all days
+        self._totals_lock = threading.Lock()
+        
         # Initialize CSV files
         self._init_metrics_csv()
         self._init_daily_summary_csv()
         
+        # Per-call rows are batched and written off the request path
+        self._metrics_appender = BufferedCSVAppender(self.metrics_file)
+        
         logger.info(f"Metrics storage initialized: {self.data_dir}")
     
     def _init_metrics_csv(self):
         """Initialize call metrics CSV with headers."""
-        if not self.metrics_file.exists():
-            headers = [
-                "call_id",
-                "vobiz_call_sid",
-                "direction",
-                "call_type",
-                "from_number_hash",
-                "to_number_hash",
-                "call_started_at",
-                "call_answered_at",
-                "call_ended_at",
-                "ring_duration",
-                "talk_duration",
-                "total_duration",
-                "call_status",
-                "disconnect_reason",
-                "call_cost",
-                "currency",
-                "audio_quality",
-                "transcript_available",
-                "campaign_id",
-                "agent_persona",
-                "user_turns",
-                "agent_turns",
-                "language",
-                "notes"
-            ]
-            
-            with open(self.metrics_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(headers)
-            
+        headers = [
+            "call_id",
+            "vobiz_call_sid",
+            "direction",
+            "call_type",
+            "from_number_hash",
+            "to_number_hash",
+            "call_started_at",
+            "call_answered_at",
+            "call_ended_at",
+            "ring_duration",
+            "talk_duration",
+            "total_duration",
+            "call_status",
+            "disconnect_reason",
+            "call_cost",
+            "currency",
+            "audio_quality",
+            "transcript_available",
+            "campaign_id",
+            "agent_persona",
+            "user_turns",
+            "agent_turns",
+            "language",
+            "notes"
+        ]
+        
+        if create_csv(self.metrics_file, headers):
             logger.info(f"Created metrics CSV: {self.metrics_file}")
     
     def _init_daily_summary_csv(self):
         """Initialize daily summary CSV with headers."""
-        if not self.daily_summary_file.exists():
-            headers = [
-                "date",
-                "total_calls",
-                "inbound_calls",
-                "outbound_calls",
-                "marketing_calls",
-                "notification_calls",
-                "customer_service_calls",
-                "completed_calls",
-                "failed_calls",
-                "no_answer_calls",
-                "avg_talk_duration",
-                "total_talk_duration",
-                "total_cost",
-                "avg_cost_per_call",
-                "avg_user_turns",
-                "transcript_coverage"
-            ]
-            
-            with open(self.daily_summary_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(headers)
-            
+        headers = [
+            "date",
+            "total_calls",
+            "inbound_calls",
+            "outbound_calls",
+            "marketing_calls",
+            "notification_calls",
+            "customer_service_calls",
+            "completed_calls",
+            "failed_calls",
+            "no_answer_calls",
+            "avg_talk_duration",
+            "total_talk_duration",
+            "total_cost",
+            "avg_cost_per_call",
+            "avg_user_turns",
+            "transcript_coverage"
+        ]
+        
+        if create_csv(self.daily_summary_file, headers):
             logger.info(f"Created daily summary CSV: {self.daily_summary_file}")
     
     def save_call_metrics(self, metrics: CallMetrics) -> bool:
@@ -115,38 +288,18 @@ class MetricsStorage:
             True if saved successfully
         """
         try:
-            with self._lock:
-                with open(self.metrics_file, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow([
-                        metrics.call_id,
-                        metrics.vobiz_call_sid or "",
-                        metrics.direction,
-                        metrics.call_type,
-                        metrics.from_number_hash or "",
-                        metrics.to_number_hash or "",
-                        metrics.call_started_at.isoformat(),
-                        metrics.call_answered_at.isoformat() if metrics.call_answered_at else "",
-                        metrics.call_ended_at.isoformat() if metrics.call_ended_at else "",
-                        metrics.ring_duration or "",
-                        metrics.talk_duration or "",
-                        metrics.total_duration or "",
-                        metrics.call_status,
-                        metrics.disconnect_reason or "",
-                        metrics.call_cost or "",
-                        metrics.currency,
-                        metrics.audio_quality or "",
-                        metrics.transcript_available,
-                        metrics.campaign_id or "",
-                        metrics.agent_persona or "",
-                        metrics.user_turns,
-                        metrics.agent_turns,
-                        metrics.language,
-                        metrics.notes or ""
-                    ])
-                
-                logger.info(f"Saved call metrics: {metrics.call_id}")
-                return True
+            day = metrics.call_started_at.date().isoformat()
+            # Queue and count together so a concurrent first scan can't miss the row
+            with self._totals_lock:
+                self._metrics_appender.append(metrics.to_csv_row())
+                totals = self._day_totals.get(day)
+                if totals is not None:
+                    totals.add(metrics)
+                if self._overview is not None:
+                    self._overview.add(metrics)
+            
+            logger.info(f"Saved call metrics: {metrics.call_id}")
+            return True
                 
         except Exception as e:
             logger.error(f"Error saving call metrics: {str(e)}", exc_info=True)
@@ -167,77 +320,130 @@ class MetricsStorage:
         date_str = target_date.isoformat()
         
         try:
-            with open(self.metrics_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                rows = [r for r in reader if r['call_started_at'].startswith(date_str)]
+            with self._totals_lock:
+                state = self._file_state()
+                totals = self._day_totals.get(date_str)
+                if totals is not None and _unchanged_since(totals.file_state, state):
+                    return totals.to_summary(date_str)
             
-            if not rows:
-                return DailyMetricsSummary(date=date_str)
+            # Scan without the lock so saves don't queue behind a dashboard read
+            scan = self._scan_day_arrow if pa is not None else self._scan_day_csv
+            totals = scan(date_str)
             
-            # Aggregate metrics
-            summary = DailyMetricsSummary(date=date_str)
-            summary.total_calls = len(rows)
+            with self._totals_lock:
+                # Install only if nothing was written during the scan; otherwise
+                # the result is still right for this read but rescanned next time
+                if self._file_state() == state:
+                    totals.file_state = state
+                    self._day_totals[date_str] = totals
+            return totals.to_summary(date_str)
+            
+        except Exception as e:
+            logger.error(f"Error getting daily summary: {str(e)}")
+            return DailyMetricsSummary(date=date_str)
+    
+    def _file_state(self) -> _FileState:
+        """Hand queued rows to the OS and snapshot the metrics file.
+        
+        Caller holds _totals_lock, so no row can be saved between the flush
+        and the stat. Scans run unlocked and are installed only if this
+        state is unchanged once they finish.
+        
+        Returns:
+            Current file state
+        """
+        self._metrics_appender.flush(sync=False)
+        st = os.stat(self.metrics_file)
+        return st.st_size, st.st_mtime_ns, self._metrics_appender.bytes_written
+    
+    def _scan_day_csv(self, date_str: str) -> _DayTotals:
+        """Fold one day's metrics rows in a single streaming CSV pass.
+        
+        Args:
+            date_str: Date prefix (YYYY-MM-DD) matched against call_started_at
             
-            total_talk_duration = 0
-            total_cost = 0.0
-            total_user_turns = 0
-            transcripts_count = 0
+        Returns:
+            Totals for the day
+        """
+        totals = _DayTotals()
+        directions = totals.directions
+        call_types = totals.call_types
+        statuses = totals.statuses
+        
+        # Single streaming pass: skip other days before parsing anything
+        with open(self.metrics_file, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            col = {name: i for i, name in enumerate(next(reader, []))}
+            started_i = col['call_started_at']
+            direction_i = col['direction']
+            call_type_i = col['call_type']
+            status_i = col['call_status']
+            talk_i = col['talk_duration']
+            cost_i = col['call_cost']
+            turns_i = col['user_turns']
+            transcript_i = col['transcript_available']
             
-            for row in rows:
-                # Direction
-                if row['direction'] == 'inbound':
-                    summary.inbound_calls += 1
-                else:
-                    summary.outbound_calls += 1
-                
-                # Call type
-                if row['call_type'] == 'marketing':
-                    summary.marketing_calls += 1
-                elif row['call_type'] == 'notification':
-                    summary.notification_calls += 1
-                elif row['call_type'] == 'customer_service':
-                    summary.customer_service_calls += 1
-                
-                # Status
-                if row['call_status'] == 'completed':
-                    summary.completed_calls += 1
-                elif row['call_status'] == 'failed':
-                    summary.failed_calls += 1
-                elif row['call_status'] == 'no_answer':
-                    summary.no_answer_calls += 1
+            for row in reader:
+                if not row[started_i].startswith(date_str):
+                    continue
                 
-                # Duration
-                if row['talk_duration']:
-                    total_talk_duration += int(row['talk_duration'])
+                totals.calls += 1
+                directions[row[direction_i]] += 1
+                call_types[row[call_type_i]] += 1
+                statuses[row[status_i]] += 1
                 
-                # Cost
-                if row['call_cost']:
-                    total_cost += float(row['call_cost'])
-                
-                # User turns
-                if row['user_turns']:
-                    total_user_turns += int(row['user_turns'])
-                
-                # Transcripts
-                if row['transcript_available'] == 'True':
-                    transcripts_count += 1
-            
-            # Calculate averages
-            summary.total_talk_duration = total_talk_duration
-            if summary.total_calls > 0:
-                summary.avg_talk_duration = total_talk_duration / summary.total_calls
-                summary.avg_user_turns = total_user_turns / summary.total_calls
-                summary.transcript_coverage = (transcripts_count / summary.total_calls) * 100
-            
-            summary.total_cost = total_cost
-            if summary.total_calls > 0:
-                summary.avg_cost_per_call = total_cost / summary.total_calls
-            
-            return summary
+                if row[talk_i]:
+                    totals.talk_duration += int(row[talk_i])
+                if row[cost_i]:
+                    totals.cost += float(row[cost_i])
+                if row[turns_i]:
+                    totals.user_turns += int(row[turns_i])
+                if row[transcript_i] == 'True':
+                    totals.transcripts += 1
+        
+        return totals
+    
+    def _scan_day_arrow(self, date_str: str) -> _DayTotals:
+        """Aggregate one day's metrics rows with pyarrow.
+        
+        Reads only the summary columns, already typed, and replaces the
+        per-row Python comparisons with a filter and a group_by.
+        
+        Args:
+            date_str: Date prefix (YYYY-MM-DD) matched against call_started_at
             
-        except Exception as e:
-            logger.error(f"Error getting daily summary: {str(e)}")
-            return DailyMetricsSummary(date=date_str)
+        Returns:
+            Totals for the day
+        """
+        totals = _DayTotals()
+        
+        table = pacsv.read_csv(
+            self.metrics_file,
+            parse_options=pacsv.ParseOptions(newlines_in_values=True),
+            convert_options=pacsv.ConvertOptions(
+                include_columns=list(_SUMMARY_COLUMN_TYPES),
+                column_types=_SUMMARY_COLUMN_TYPES
+            )
+        )
+        table = table.filter(pc.starts_with(table["call_started_at"], pattern=date_str))
+        if table.num_rows == 0:
+            return totals
+        
+        groups = table.group_by(["direction", "call_type", "call_status"]).aggregate(
+            [([], "count_all")]
+        )
+        for group in groups.to_pylist():
+            count = group["count_all"]
+            totals.directions[group["direction"]] += count
+            totals.call_types[group["call_type"]] += count
+            totals.statuses[group["call_status"]] += count
+        
+        totals.calls = table.num_rows
+        totals.talk_duration = pc.sum(table["talk_duration"]).as_py() or 0
+        totals.cost = pc.sum(table["call_cost"]).as_py() or 0.0
+        totals.user_turns = pc.sum(table["user_turns"]).as_py() or 0
+        totals.transcripts = pc.sum(table["transcript_available"].cast(pa.int64())).as_py() or 0
+        return totals
     
     def save_daily_summary(self, summary: DailyMetricsSummary) -> bool:
         """Save daily summary to CSV.
@@ -285,32 +491,79 @@ class MetricsStorage:
             Dictionary with overview statistics
         """
         try:
-            with open(self.metrics_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                rows = list(reader)
-            
-            if not rows:
-                return {"total_calls": 0}
-            
-            total_calls = len(rows)
-            completed = len([r for r in rows if r['call_status'] == 'completed'])
+            with self._totals_lock:
+                state = self._file_state()
+                overview = self._overview
+                if overview is not None and _unchanged_since(overview.file_state, state):
+                    return overview.to_dict()
             
-            total_duration = sum(int(r['total_duration']) for r in rows if r['total_duration'])
-            total_cost = sum(float(r['call_cost']) for r in rows if r['call_cost'])
+            # Same as get_daily_summary: scan unlocked, install if still current
+            overview = self._scan_overview()
             
-            return {
-                "total_calls": total_calls,
-                "completed_calls": completed,
-                "completion_rate": (completed / total_calls * 100) if total_calls > 0 else 0,
-                "total_duration_minutes": total_duration / 60,
-                "total_cost": total_cost,
-                "avg_cost_per_call": (total_cost / total_calls) if total_calls > 0 else 0
-            }
+            with self._totals_lock:
+                if self._file_state() == state:
+                    overview.file_state = state
+                    self._overview = overview
+            return overview.to_dict()
             
         except Exception as e:
             logger.error(f"Error getting metrics overview: {str(e)}")
             return {"error": str(e)}
+    
+    def _scan_overview(self) -> _OverviewTotals:
+        """Fold every metrics row in a single streaming CSV pass.
+        
+        Returns:
+            Totals across all days
+        """
+        totals = _OverviewTotals()
+        
+        # Stream rows instead of loading the whole file
+        with open(self.metrics_file, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            col = {name: i for i, name in enumerate(next(reader, []))}
+            status_i = col['call_status']
+            duration_i = col['total_duration']
+            cost_i = col['call_cost']
+            
+            for row in reader:
+                totals.calls += 1
+                if row[status_i] == 'completed':
+                    totals.completed += 1
+                if row[duration_i]:
+                    totals.duration += int(row[duration_i])
+                if row[cost_i]:
+                    totals.cost += float(row[cost_i])
+        
+        return totals
+    
+    def flush(self):
+        """Write all queued metrics rows to disk."""
+        self._metrics_appender.flush()
+    
+    def close(self):
+        """Flush queued rows and stop the background writer."""
+        self._metrics_appender.close()
+
+
+# Global storage instance, created on first use so importing this module
+# does no filesystem work
+_metrics_storage: Optional[MetricsStorage] = None
+_metrics_storage_lock = threading.Lock()
 
 
-# Global storage instance
-metrics_storage = MetricsStorage()
+def get_metrics_storage() -> MetricsStorage:
+    """Get the global storage instance, creating it on first call.
+    
+    Creation is locked: BackgroundTasks call in from the threadpool, and a
+    second instance would start its own flush thread and atexit hook.
+    
+    Returns:
+        Shared MetricsStorage
+    """
+    global _metrics_storage
+    if _metrics_storage is None:
+        with _metrics_storage_lock:
+            if _metrics_storage is None:
+                _metrics_storage = MetricsStorage()
+    return _metrics_storage
@@ -1,10 +1,14 @@
 """Data models for call logs and metrics."""
 
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
 from enum import Enum
 from typing import Optional, Dict, Any
 from pydantic import BaseModel, Field
 
+# Naive UTC epoch, matching the datetime.utcnow() timestamps used elsewhere
+_EPOCH = datetime(1970, 1, 1)
+
 
 class CallDirection(str, Enum):
     """Call direction types."""
@@ -31,8 +35,8 @@ class CallType(str, Enum):
     GENERAL = "general"
 
 
-class CallSession(BaseModel):
-    """Active call session state."""
+class CallSessionModel(BaseModel):
+    """Call session state as exposed at API boundaries."""
     
     call_id: str = Field(..., description="Unique call identifier from Vobiz")
     direction: CallDirection
@@ -64,6 +68,72 @@ class CallSession(BaseModel):
         use_enum_values = True
 
 
+@dataclass(slots=True)
+class CallSession:
+    """Active call session state.
+    
+    Plain slotted dataclass: webhooks mutate live sessions on every event
+    and this internal state needs no validation, so field writes are simple
+    slot stores. Convert with to_model() when returning it from the API.
+    """
+    
+    call_id: str
+    direction: CallDirection
+    from_number: str
+    to_number: str
+    call_type: CallType = CallType.GENERAL
+    status: CallStatus = CallStatus.INITIATED
+    
+    # Timestamps
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    answered_at: Optional[datetime] = None
+    ended_at: Optional[datetime] = None
+    
+    # Session data
+    conversation_history: list[Dict[str, Any]] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    
+    # Audio processing state
+    audio_stream_active: bool = False
+    current_transcript: str = ""
+    
+    # Outbound call specific fields
+    campaign_metadata: Optional[Dict[str, Any]] = None
+    notification_metadata: Optional[Dict[str, Any]] = None
+    
+    def to_model(self) -> CallSessionModel:
+        """Build the validated pydantic model of this session.
+        
+        Returns:
+            CallSessionModel with the same field values
+        """
+        data = {name: getattr(self, name) for name in self.__slots__}
+        
+        # Turns store raw ns timestamps; the API still shows ISO strings
+        data["conversation_history"] = [
+            {
+                "role": turn["role"],
+                "content": turn["content"],
+                "timestamp": self.turn_timestamp(turn["ts_ns"]),
+                "metadata": turn["metadata"]
+            }
+            for turn in self.conversation_history
+        ]
+        return CallSessionModel(**data)
+    
+    @staticmethod
+    def turn_timestamp(ts_ns: int) -> str:
+        """Format a conversation turn's timestamp.
+        
+        Args:
+            ts_ns: Turn time from time.time_ns()
+        
+        Returns:
+            Naive UTC ISO-8601 string
+        """
+        return (_EPOCH + timedelta(microseconds=ts_ns // 1000)).isoformat()
+
+
 class CampaignMetadata(BaseModel):
     """Marketing campaign metadata."""
     
@@ -1,17 +1,42 @@
 """Call session manager for tracking active calls."""
 
-from typing import Dict, Optional
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional
 from datetime import datetime
 
 from app.storage.models import CallSession, CallDirection, CallStatus, CallType
 
+logger = logging.getLogger(__name__)
+
+# Seconds between idle-session sweeps
+_EVICT_INTERVAL = 30.0
+
 
 class SessionManager:
-    """In-memory session manager for active calls."""
+    """In-memory session manager for active calls.
+    
+    Sessions are kept in least-recently-touched order so calls whose final
+    webhook never arrived can be evicted from the front without a full scan.
+    """
     
     def __init__(self):
         """Initialize session storage."""
-        self._sessions: Dict[str, CallSession] = {}
+        self._sessions: "OrderedDict[str, CallSession]" = OrderedDict()
+        self._touched: Dict[str, float] = {}  # call_id -> last access (monotonic)
+        self._sessions_view = MappingProxyType(self._sessions)
+    
+    def _touch(self, call_id: str):
+        """Mark a session as just used, moving it to the back of the order.
+        
+        Args:
+            call_id: Call identifier
+        """
+        self._touched[call_id] = time.monotonic()
+        self._sessions.move_to_end(call_id)
     
     def create_session(
         self,
@@ -46,6 +71,7 @@ class SessionManager:
         )
         
         self._sessions[call_id] = session
+        self._touch(call_id)  # Also moves a recreated ID to the back
         return session
     
     def get_session(self, call_id: str) -> Optional[CallSession]:
@@ -57,7 +83,10 @@ class SessionManager:
         Returns:
             CallSession if found, None otherwise
         """
-        return self._sessions.get(call_id)
+        session = self._sessions.get(call_id)
+        if session:
+            self._touch(call_id)
+        return session
     
     def update_status(self, call_id: str, status: CallStatus) -> Optional[CallSession]:
         """Update call status.
@@ -69,15 +98,29 @@ class SessionManager:
         Returns:
             Updated CallSession if found, None otherwise
         """
-        session = self._sessions.get(call_id)
+        session = self.get_session(call_id)
         if session:
-            session.status = status
+            self.update_status_session(session, status)
+        
+        return session
+    
+    def update_status_session(self, session: CallSession, status: CallStatus) -> CallSession:
+        """Update status on an already-fetched session, skipping the ID lookup.
+        
+        Args:
+            session: Call session
+            status: New status
             
-            # Update timestamps based on status
-            if status == CallStatus.IN_PROGRESS and not session.answered_at:
-                session.answered_at = datetime.utcnow()
-            elif status in [CallStatus.COMPLETED, CallStatus.FAILED, CallStatus.NO_ANSWER, CallStatus.BUSY]:
-                session.ended_at = datetime.utcnow()
+        Returns:
+            Updated CallSession
+        """
+        session.status = status
+        
+        # Update timestamps based on status
+        if status == CallStatus.IN_PROGRESS and not session.answered_at:
+            session.answered_at = datetime.utcnow()
+        elif status in [CallStatus.COMPLETED, CallStatus.FAILED, CallStatus.NO_ANSWER, CallStatus.BUSY]:
+            session.ended_at = datetime.utcnow()
         
         return session
     
@@ -99,12 +142,13 @@ class SessionManager:
         Returns:
             Updated CallSession if found, None otherwise
         """
-        session = self._sessions.get(call_id)
+        session = self.get_session(call_id)
         if session:
+            # Raw ns int per turn; formatted only when the session is exported
             turn = {
                 "role": role,
                 "content": content,
-                "timestamp": datetime.utcnow().isoformat(),
+                "ts_ns": time.time_ns(),
                 "metadata": metadata or {}
             }
             session.conversation_history.append(turn)
@@ -121,7 +165,7 @@ class SessionManager:
         Returns:
             Updated CallSession if found, None otherwise
         """
-        session = self._sessions.get(call_id)
+        session = self.get_session(call_id)
         if session:
             session.audio_stream_active = active
         
@@ -137,7 +181,7 @@ class SessionManager:
         Returns:
             Updated CallSession if found, None otherwise
         """
-        session = self._sessions.get(call_id)
+        session = self.get_session(call_id)
         if session:
             session.current_transcript = transcript
         
@@ -153,23 +197,97 @@ class SessionManager:
             Removed CallSession if found, None otherwise
         """
         session = self._sessions.pop(call_id, None)
-        if session and not session.ended_at:
-            session.ended_at = datetime.utcnow()
-            session.status = CallStatus.COMPLETED
+        if session:
+            del self._touched[call_id]
+            self._finalize(session)
+        
+        return session
+    
+    def end_session_obj(self, session: CallSession) -> CallSession:
+        """End and remove an already-fetched session.
         
+        Args:
+            session: Call session
+            
+        Returns:
+            Removed CallSession
+        """
+        self._sessions.pop(session.call_id, None)
+        self._touched.pop(session.call_id, None)
+        self._finalize(session)
         return session
     
-    def get_active_sessions(self) -> Dict[str, CallSession]:
+    @staticmethod
+    def _finalize(session: CallSession):
+        """Stamp end time and completed status if not already ended.
+        
+        Args:
+            session: Call session
+        """
+        if not session.ended_at:
+            session.ended_at = datetime.utcnow()
+            session.status = CallStatus.COMPLETED
+    
+    def get_active_sessions(self) -> Mapping[str, CallSession]:
         """Get all active sessions.
         
+        The view is live: iterate it without awaiting in between (or use
+        snapshot()), since webhooks add and remove sessions concurrently.
+        
         Returns:
-            Dictionary of active sessions
+            Read-only view of active sessions
+        """
+        return self._sessions_view
+    
+    def snapshot(self) -> Dict[str, CallSession]:
+        """Copy the active sessions.
+        
+        Returns:
+            Dictionary of active sessions at this moment
+        """
+        return dict(self._sessions)
+    
+    def evict_idle(self, max_idle: float) -> int:
+        """End sessions not touched within max_idle seconds.
+        
+        Args:
+            max_idle: Idle time in seconds after which a session is dropped
+            
+        Returns:
+            Number of sessions evicted
+        """
+        cutoff = time.monotonic() - max_idle
+        evicted = 0
+        
+        # Oldest-touched first, so stop at the first live session
+        while self._sessions:
+            call_id = next(iter(self._sessions))
+            if self._touched[call_id] > cutoff:
+                break
+            _, session = self._sessions.popitem(last=False)
+            del self._touched[call_id]
+            self._finalize(session)
+            evicted += 1
+        
+        if evicted:
+            logger.warning("Evicted %d idle call sessions (no activity for %ss)", evicted, max_idle)
+        return evicted
+    
+    async def run_evictor(self, max_idle: float, interval: float = _EVICT_INTERVAL):
+        """Periodically evict idle sessions until cancelled.
+        
+        Args:
+            max_idle: Idle time in seconds after which a session is dropped
+            interval: Seconds between sweeps
         """
-        return self._sessions.copy()
+        while True:
+            await asyncio.sleep(interval)
+            self.evict_idle(max_idle)
     
     def clear_all(self):
         """Clear all sessions (for testing/cleanup)."""
         self._sessions.clear()
+        self._touched.clear()
 
 
 # Global session manager instance
@@ -1,6 +1,7 @@
 """Vobiz.ai API client for making outbound calls and managing telephony."""
 
 import httpx
+import orjson
 from typing import Optional, Dict, Any
 from base64 import b64encode
 import logging
@@ -28,6 +29,33 @@ class VobizClient:
             "Authorization": f"Basic {encoded_credentials}",
             "Content-Type": "application/json"
         }
+        
+        # Call API endpoint (detail/hangup URLs append the call ID)
+        self._call_endpoint = f"{self.base_url}/api/v1/Account/{self.auth_id}/Call/"
+        
+        # Shared keep-alive pool, opened at app startup (or lazily on first use)
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    def start(self) -> httpx.AsyncClient:
+        """Create the pooled HTTP client if not already open.
+        
+        Returns:
+            Shared AsyncClient
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                headers=self.headers,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=128),
+                timeout=httpx.Timeout(30.0, connect=5.0)
+            )
+        return self._client
+    
+    async def close(self):
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def initiate_call(
         self,
@@ -77,37 +105,36 @@ class VobizClient:
             payload["notification_type"] = request.notification_metadata.notification_type
             payload["priority"] = request.notification_metadata.priority
         
-        # API endpoint
-        endpoint = f"{self.base_url}/api/v1/Account/{self.auth_id}/Call/"
+        endpoint = self._call_endpoint
         
         logger.info(f"Initiating outbound call to {request.to_number} via {endpoint}")
         logger.debug(f"Request payload: {payload}")
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    endpoint,
-                    json=payload,
-                    headers=self.headers,
-                    timeout=30.0
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                logger.info(f"Vobiz API success response: {result}")
-                logger.info(f"Call initiated successfully: {result.get('CallSid') or result.get('call_sid') or result.get('CallUUID') or result.get('call_uuid')}")
-                return result
-                
-            except httpx.HTTPStatusError as e:
-                # Log the error response body for debugging
-                error_detail = e.response.text
-                logger.error(f"Failed to initiate call: {str(e)}")
-                logger.error(f"Vobiz API response: {error_detail}")
-                logger.error(f"Request payload was: {payload}")
-                raise
-            except httpx.HTTPError as e:
-                logger.error(f"Failed to initiate call: {str(e)}")
-                raise
+        client = self.start()
+        try:
+            # Content-Type is already in the client headers; orjson encodes in native code
+            response = await client.post(
+                endpoint,
+                content=orjson.dumps(payload),
+                timeout=30.0
+            )
+            response.raise_for_status()
+            
+            result = orjson.loads(response.content)
+            logger.info(f"Vobiz API success response: {result}")
+            logger.info(f"Call initiated successfully: {result.get('CallSid') or result.get('call_sid') or result.get('CallUUID') or result.get('call_uuid')}")
+            return result
+            
+        except httpx.HTTPStatusError as e:
+            # Log the error response body for debugging
+            error_detail = e.response.text
+            logger.error(f"Failed to initiate call: {str(e)}")
+            logger.error(f"Vobiz API response: {error_detail}")
+            logger.error(f"Request payload was: {payload}")
+            raise
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to initiate call: {str(e)}")
+            raise
     
     async def get_call_details(self, call_sid: str) -> Dict[str, Any]:
         """Retrieve call details from Vobiz.ai.
@@ -118,12 +145,11 @@ class VobizClient:
         Returns:
             Call details
         """
-        endpoint = f"{self.base_url}/api/v1/Account/{self.auth_id}/Call/{call_sid}"
+        endpoint = self._call_endpoint + call_sid
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(endpoint, headers=self.headers, timeout=10.0)
-            response.raise_for_status()
-            return response.json()
+        response = await self.start().get(endpoint, timeout=10.0)
+        response.raise_for_status()
+        return orjson.loads(response.content)
     
     async def hangup_call(self, call_sid: str) -> Dict[str, Any]:
         """Hangup an active call.
@@ -134,12 +160,11 @@ class VobizClient:
         Returns:
             API response
         """
-        endpoint = f"{self.base_url}/api/v1/Account/{self.auth_id}/Call/{call_sid}"
+        endpoint = self._call_endpoint + call_sid
         
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(endpoint, headers=self.headers, timeout=10.0)
-            response.raise_for_status()
-            return response.json()
+        response = await self.start().delete(endpoint, timeout=10.0)
+        response.raise_for_status()
+        return orjson.loads(response.content)
 
 
 # Global client instance
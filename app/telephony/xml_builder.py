@@ -1,15 +1,29 @@
 """XML response builder for Vobiz.ai telephony apps."""
 
 from typing import Optional, List
-from xml.etree.ElementTree import Element, SubElement, tostring
+from xml.sax.saxutils import escape
+
+# Same escaping ElementTree applies to attribute values (text only needs &<>)
+_ATTR_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#09;"}
+
+_XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+
+def _attr(value: str) -> str:
+    """Escape a value for use inside a double-quoted XML attribute."""
+    return escape(value, _ATTR_ENTITIES)
 
 
 class VobizXMLResponse:
-    """Builder for Vobiz.ai XML responses (TwiML-compatible)."""
+    """Builder for Vobiz.ai XML responses (TwiML-compatible).
+    
+    The grammar is flat, so each verb is rendered straight to an XML fragment
+    and build() joins them; no element tree is allocated or walked.
+    """
     
     def __init__(self):
-        """Initialize XML response with root element."""
-        self.root = Element("Response")
+        """Initialize XML response with an empty verb list."""
+        self._parts: List[str] = []
     
     def say(
         self,
@@ -24,10 +38,9 @@ class VobizXMLResponse:
             voice: Voice identifier
             language: Language code
         """
-        say_elem = SubElement(self.root, "Say")
-        say_elem.set("voice", voice)
-        say_elem.set("language", language)
-        say_elem.text = text
+        self._parts.append(
+            f'<Say voice="{_attr(voice)}" language="{_attr(language)}">{escape(text)}</Say>'
+        )
         return self
     
     def play(self, url: str) -> "VobizXMLResponse":
@@ -36,8 +49,7 @@ class VobizXMLResponse:
         Args:
             url: Audio file URL
         """
-        play_elem = SubElement(self.root, "Play")
-        play_elem.text = url
+        self._parts.append(f"<Play>{escape(url)}</Play>")
         return self
     
     def gather(
@@ -59,16 +71,11 @@ class VobizXMLResponse:
             finish_on_key: Key to end input
             input_type: Input types to accept (dtmf, speech, or both)
         """
-        gather_elem = SubElement(self.root, "Gather")
-        gather_elem.set("action", action)
-        gather_elem.set("method", method)
-        gather_elem.set("timeout", str(timeout))
-        gather_elem.set("input", input_type)
-        gather_elem.set("finishOnKey", finish_on_key)
-        
-        if num_digits:
-            gather_elem.set("numDigits", str(num_digits))
-        
+        digits = f' numDigits="{num_digits}"' if num_digits else ""
+        self._parts.append(
+            f'<Gather action="{_attr(action)}" method="{_attr(method)}" timeout="{timeout}" '
+            f'input="{_attr(input_type)}" finishOnKey="{_attr(finish_on_key)}"{digits} />'
+        )
         return self
     
     def gather_with_prompt(
@@ -88,18 +95,13 @@ class VobizXMLResponse:
             timeout: Seconds to wait for input
             input_type: Input types to accept
         """
-        gather_elem = SubElement(self.root, "Gather")
-        gather_elem.set("action", action)
-        gather_elem.set("method", method)
-        gather_elem.set("timeout", str(timeout))
-        gather_elem.set("input", input_type)
-        
-        # Add Say element inside Gather
-        say_elem = SubElement(gather_elem, "Say")
-        say_elem.set("voice", "en-IN-Neural2-A")
-        say_elem.set("language", "en-IN")
-        say_elem.text = prompt_text
-        
+        # Say element nested inside Gather
+        self._parts.append(
+            f'<Gather action="{_attr(action)}" method="{_attr(method)}" timeout="{timeout}" '
+            f'input="{_attr(input_type)}">'
+            f'<Say voice="en-IN-Neural2-A" language="en-IN">{escape(prompt_text)}</Say>'
+            f'</Gather>'
+        )
         return self
     
     def record(
@@ -119,12 +121,10 @@ class VobizXMLResponse:
             finish_on_key: Key to stop recording
             transcribe: Whether to transcribe recording
         """
-        record_elem = SubElement(self.root, "Record")
-        record_elem.set("action", action)
-        record_elem.set("method", method)
-        record_elem.set("maxLength", str(max_length))
-        record_elem.set("finishOnKey", finish_on_key)
-        record_elem.set("transcribe", "true" if transcribe else "false")
+        self._parts.append(
+            f'<Record action="{_attr(action)}" method="{_attr(method)}" maxLength="{max_length}" '
+            f'finishOnKey="{_attr(finish_on_key)}" transcribe="{"true" if transcribe else "false"}" />'
+        )
         return self
     
     def redirect(self, url: str, method: str = "POST") -> "VobizXMLResponse":
@@ -134,14 +134,12 @@ class VobizXMLResponse:
             url: Webhook URL to redirect to
             method: HTTP method
         """
-        redirect_elem = SubElement(self.root, "Redirect")
-        redirect_elem.set("method", method)
-        redirect_elem.text = url
+        self._parts.append(f'<Redirect method="{_attr(method)}">{escape(url)}</Redirect>')
         return self
     
     def hangup(self) -> "VobizXMLResponse":
         """End the call."""
-        SubElement(self.root, "Hangup")
+        self._parts.append("<Hangup />")
         return self
     
     def pause(self, length: int = 1) -> "VobizXMLResponse":
@@ -150,8 +148,7 @@ class VobizXMLResponse:
         Args:
             length: Pause duration in seconds
         """
-        pause_elem = SubElement(self.root, "Pause")
-        pause_elem.set("length", str(length))
+        self._parts.append(f'<Pause length="{length}" />')
         return self
     
     def build(self) -> str:
@@ -160,15 +157,17 @@ class VobizXMLResponse:
         Returns:
             XML string with proper declaration
         """
-        xml_bytes = tostring(self.root, encoding="utf-8", method="xml")
-        return '<?xml version="1.0" encoding="UTF-8"?>\n' + xml_bytes.decode("utf-8")
+        if not self._parts:
+            return _XML_DECLARATION + "<Response />"
+        return _XML_DECLARATION + "<Response>" + "".join(self._parts) + "</Response>"
 
 
-def create_welcome_response(callback_url: str) -> str:
-    """Create a welcome message with speech gathering.
+def _build_welcome_response(action: str, redirect_url: str) -> str:
+    """Build the welcome flow XML.
     
     Args:
-        callback_url: URL to send speech results
+        action: Gather webhook URL
+        redirect_url: URL to redirect to when no input is heard
         
     Returns:
         XML response string
@@ -177,16 +176,43 @@ def create_welcome_response(callback_url: str) -> str:
         VobizXMLResponse()
         .gather_with_prompt(
             prompt_text="Welcome to our service. How may I help you today?",
-            action=callback_url,
+            action=action,
             timeout=5,
             input_type="speech"
         )
         .say("I didn't catch that. Please try again.")
-        .redirect(callback_url)
+        .redirect(redirect_url)
         .build()
     )
 
 
+# Only the callback URL varies per call, so the welcome XML is built once
+# around two markers and split; each request just joins in the escaped URL
+_ACTION_MARKER = "__WELCOME_ACTION__"
+_REDIRECT_MARKER = "__WELCOME_REDIRECT__"
+_WELCOME_HEAD, _rest = _build_welcome_response(_ACTION_MARKER, _REDIRECT_MARKER).split(_ACTION_MARKER)
+_WELCOME_MIDDLE, _WELCOME_TAIL = _rest.split(_REDIRECT_MARKER)
+del _rest
+
+
+def create_welcome_response(callback_url: str) -> str:
+    """Create a welcome message with speech gathering.
+    
+    Args:
+        callback_url: URL to send speech results
+        
+    Returns:
+        XML response string
+    """
+    return "".join((
+        _WELCOME_HEAD,
+        _attr(callback_url),
+        _WELCOME_MIDDLE,
+        escape(callback_url),
+        _WELCOME_TAIL
+    ))
+
+
 def create_error_response(error_message: str = "We're experiencing technical difficulties.") -> str:
     """Create an error response.
     
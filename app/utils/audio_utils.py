@@ -3,14 +3,39 @@
 import logging
 from typing import Optional
 import audioop
+import struct
 import wave
 import io
 
 logger = logging.getLogger(__name__)
 
+# NumPy is optional (langchain installs it); without it audioop does all coding
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Canonical 44-byte PCM WAV header: RIFF chunk, 16-byte fmt chunk, data header
+_WAV_HEADER = struct.Struct("<4sI4s4sIHHIIHH4sI")
+
+# Below this much 16-bit PCM, numpy call overhead outweighs the faster encode
+_LUT_ENCODE_MIN_BYTES = 1024
+
+if np is not None:
+    # μ-law byte for every 16-bit sample, indexed by the sample's raw bits.
+    # Built from audioop so both paths are bit-identical.
+    _PCM16_TO_ULAW = np.frombuffer(
+        audioop.lin2ulaw(np.arange(1 << 16, dtype=np.uint16).tobytes(), 2),
+        dtype=np.uint8
+    )
+
 
 class AudioConverter:
-    """Utilities for audio format conversion for telephony."""
+    """Utilities for audio format conversion for telephony.
+    
+    Codec errors propagate: returning the input on failure would pass PCM
+    off as μ-law (or vice versa), so callers drop or count bad frames.
+    """
     
     @staticmethod
     def pcm_to_mulaw(pcm_data: bytes, sample_width: int = 2) -> bytes:
@@ -22,12 +47,16 @@ class AudioConverter:
             
         Returns:
             μ-law encoded audio bytes
+            
+        Raises:
+            audioop.error: If the data is not whole samples of sample_width
         """
-        try:
-            return audioop.lin2ulaw(pcm_data, sample_width)
-        except Exception as e:
-            logger.error(f"Error converting PCM to μ-law: {str(e)}")
-            return pcm_data
+        size = len(pcm_data)
+        if np is not None and sample_width == 2 and size >= _LUT_ENCODE_MIN_BYTES and not size & 1:
+            # One table gather per buffer instead of audioop's per-sample
+            # segment search (several times faster on multi-KB buffers)
+            return _PCM16_TO_ULAW.take(np.frombuffer(pcm_data, dtype=np.uint16)).tobytes()
+        return audioop.lin2ulaw(pcm_data, sample_width)
     
     @staticmethod
     def mulaw_to_pcm(mulaw_data: bytes, sample_width: int = 2) -> bytes:
@@ -39,12 +68,11 @@ class AudioConverter:
             
         Returns:
             PCM audio bytes
+            
+        Raises:
+            audioop.error: If sample_width is not 1, 2, 3 or 4
         """
-        try:
-            return audioop.ulaw2lin(mulaw_data, sample_width)
-        except Exception as e:
-            logger.error(f"Error converting μ-law to PCM: {str(e)}")
-            return mulaw_data
+        return audioop.ulaw2lin(mulaw_data, sample_width)
     
     @staticmethod
     def resample_audio(
@@ -54,7 +82,10 @@ class AudioConverter:
         sample_width: int = 2,
         channels: int = 1
     ) -> bytes:
-        """Resample audio to different sample rate.
+        """Resample a complete clip to a different sample rate.
+        
+        One-shot: the filter starts fresh each call, so use Resampler for
+        streamed chunks.
         
         Args:
             audio_data: Audio bytes
@@ -65,19 +96,18 @@ class AudioConverter:
             
         Returns:
             Resampled audio bytes
+            
+        Raises:
+            audioop.error: If the data is not whole frames or a rate is invalid
         """
-        try:
-            return audioop.ratecv(
-                audio_data,
-                sample_width,
-                channels,
-                from_rate,
-                to_rate,
-                None
-            )[0]
-        except Exception as e:
-            logger.error(f"Error resampling audio: {str(e)}")
-            return audio_data
+        return audioop.ratecv(
+            audio_data,
+            sample_width,
+            channels,
+            from_rate,
+            to_rate,
+            None
+        )[0]
     
     @staticmethod
     def create_wav_header(
@@ -97,26 +127,71 @@ class AudioConverter:
         Returns:
             WAV header bytes
         """
-        # RIFF header
-        header = b'RIFF'
-        header += (36 + data_size).to_bytes(4, 'little')
-        header += b'WAVE'
-        
-        # fmt chunk
-        header += b'fmt '
-        header += (16).to_bytes(4, 'little')  # Chunk size
-        header += (1).to_bytes(2, 'little')   # Audio format (PCM)
-        header += channels.to_bytes(2, 'little')
-        header += sample_rate.to_bytes(4, 'little')
-        header += (sample_rate * channels * sample_width).to_bytes(4, 'little')  # Byte rate
-        header += (channels * sample_width).to_bytes(2, 'little')  # Block align
-        header += (sample_width * 8).to_bytes(2, 'little')  # Bits per sample
+        return _WAV_HEADER.pack(
+            b'RIFF', 36 + data_size, b'WAVE',
+            b'fmt ', 16, 1,  # Chunk size, audio format (PCM)
+            channels,
+            sample_rate,
+            sample_rate * channels * sample_width,  # Byte rate
+            channels * sample_width,  # Block align
+            sample_width * 8,  # Bits per sample
+            b'data', data_size
+        )
+
+
+class Resampler:
+    """Stateful sample-rate converter for a continuous audio stream.
+    
+    audioop.ratecv carries filter state between calls; keeping it avoids
+    clicks and aliasing at chunk boundaries. Use one per stream direction.
+    """
+    
+    def __init__(
+        self,
+        from_rate: int,
+        to_rate: int,
+        sample_width: int = 2,
+        channels: int = 1
+    ):
+        """Initialize resampler.
         
-        # data chunk
-        header += b'data'
-        header += data_size.to_bytes(4, 'little')
+        Args:
+            from_rate: Source sample rate
+            to_rate: Target sample rate
+            sample_width: Sample width in bytes
+            channels: Number of channels
+        """
+        self.from_rate = from_rate
+        self.to_rate = to_rate
+        self.sample_width = sample_width
+        self.channels = channels
+        self._state = None
+    
+    def feed(self, audio_data: bytes) -> bytes:
+        """Resample the next chunk of the stream.
         
-        return header
+        Args:
+            audio_data: Audio bytes (whole frames)
+            
+        Returns:
+            Resampled audio bytes
+            
+        Raises:
+            audioop.error: If the data is not whole frames
+        """
+        converted, self._state = audioop.ratecv(
+            audio_data,
+            self.sample_width,
+            self.channels,
+            self.from_rate,
+            self.to_rate,
+            self._state
+        )
+        return converted
+    
+    def reset(self):
+        """Drop filter state before reusing the resampler on a new stream."""
+        self._state = None
 
 
 class AudioStreamBuffer:
@@ -147,7 +222,9 @@ class AudioStreamBuffer:
         """
         if len(self.buffer) >= self.chunk_size:
             chunk = bytes(self.buffer[:self.chunk_size])
-            self.buffer = self.buffer[self.chunk_size:]
+            # In-place front delete is amortized O(1) for bytearray; slicing
+            # the remainder would copy the whole buffer on every chunk
+            del self.buffer[:self.chunk_size]
             return chunk
         return None
     
@@ -187,21 +264,27 @@ def validate_telephony_audio(
         True if valid, False otherwise
     """
     # Basic validation - check if data exists
-    if not audio_data or len(audio_data) == 0:
+    size = len(audio_data)
+    if not size:
         logger.warning("Empty audio data")
         return False
     
     # For μ-law at 8kHz, typical duration should be reasonable
-    # 8000 samples/sec, 1 byte per sample for μ-law
-    duration_seconds = len(audio_data) / expected_rate
+    # 8000 samples/sec, 1 byte per sample for μ-law. Bounds are compared
+    # as byte counts; the duration is only computed for log messages.
+    if size * 10 < expected_rate:  # Under 0.1s
+        logger.warning(f"Audio too short: {size / expected_rate}s")
+        return False
     
-    if duration_seconds < 0.1:
-        logger.warning(f"Audio too short: {duration_seconds}s")
+    if size > 300 * expected_rate:  # 5 minutes max
+        logger.warning(f"Audio too long: {size / expected_rate}s")
         return False
     
-    if duration_seconds > 300:  # 5 minutes max
-        logger.warning(f"Audio too long: {duration_seconds}s")
+    # Constant signal (e.g. all μ-law silence bytes) - bytes.count scans in C
+    if audio_data.count(audio_data[:1]) == size:
+        logger.warning("Audio is a constant signal")
         return False
     
-    logger.info(f"Audio validated: {len(audio_data)} bytes, ~{duration_seconds:.2f}s")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(f"Audio validated: {size} bytes, ~{size / expected_rate:.2f}s")
     return True
@@ -1,7 +1,60 @@
 """Structured logging configuration."""
 
+import logging
+import time
+
 # TODO: Configure structured logging:
 # - JSON formatted logs for production
 # - Request/response logging
 # - Error tracking
 # - Performance metrics
+
+
+class ThrottledErrorLog:
+    """Error logger that caps traceback formatting during failure storms.
+    
+    The first ``limit`` errors in each ``window`` seconds are logged with
+    their traceback. Later ones in the same window are logged as a single
+    line and counted; the count is reported when the window rolls over.
+    An upstream outage then costs one log line per failure instead of a
+    full traceback walk.
+    """
+    
+    def __init__(self, logger: logging.Logger, limit: int = 5, window: float = 60.0):
+        """Initialize throttled logger.
+        
+        Args:
+            logger: Logger to write to
+            limit: Tracebacks logged per window
+            window: Window length in seconds
+        """
+        self.logger = logger
+        self.limit = limit
+        self.window = window
+        self._window_start = time.monotonic()
+        self._count = 0
+        self._suppressed = 0
+    
+    def error(self, msg: str, *args):
+        """Log the exception currently being handled.
+        
+        Must be called from inside an except block.
+        
+        Args:
+            msg: %-style message
+            *args: Message arguments
+        """
+        now = time.monotonic()
+        if now - self._window_start >= self.window:
+            if self._suppressed:
+                self.logger.warning("Suppressed %d error tracebacks in the last %.0fs", self._suppressed, self.window)
+            self._window_start = now
+            self._count = 0
+            self._suppressed = 0
+        
+        self._count += 1
+        if self._count <= self.limit:
+            self.logger.error(msg, *args, exc_info=True)
+        else:
+            self._suppressed += 1
+            self.logger.error(msg, *args)
@@ -0,0 +1,55 @@
+"""Shared helpers for the manual test scripts."""
+
+import asyncio
+import io
+import sys
+from typing import Any, Coroutine
+
+
+def emit(out: io.StringIO):
+    """Write a test's buffered output to stdout in one block.
+    
+    Tests that run concurrently print into their own buffer so their
+    sections don't interleave.
+    
+    Args:
+        out: Buffer the test printed into
+    """
+    sys.stdout.write(out.getvalue())
+
+
+async def _run_eager(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Await a coroutine with eager task creation enabled when available.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    # Python 3.12+: run new tasks eagerly up to their first await, so calls
+    # that finish without I/O (cache hits) skip a scheduler round trip
+    eager_task_factory = getattr(asyncio, "eager_task_factory", None)
+    if eager_task_factory is not None:
+        asyncio.get_running_loop().set_task_factory(eager_task_factory)
+    
+    return await coro
+
+
+def run(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a test script's main coroutine on the fastest available loop.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+    """
+    # Use libuv-based event loop where available (not on Windows)
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+    
+    return asyncio.run(_run_eager(coro))
@@ -4,7 +4,7 @@ import asyncio
 import logging
 from datetime import datetime
 from app.storage.data_capture import MarketingCallData, extract_user_interest, UserInterest
-from app.storage.csv_storage import csv_storage
+from app.storage.csv_storage import get_csv_storage
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -43,14 +43,15 @@ def test_csv_storage():
     print("="*60)
     
     # Create test marketing call data
+    now = datetime.utcnow()
     test_data = MarketingCallData(
         call_id="TEST123",
         campaign_id="CAMP-TEST-001",
         campaign_name="Test Campaign",
         user_interest=UserInterest.YES,
         language="en-IN",
-        call_started_at=datetime.utcnow(),
-        call_ended_at=datetime.utcnow(),
+        call_started_at=now,
+        call_ended_at=now,
         call_duration_seconds=45,
         response_time_seconds=5,
         segment="test_segment",
@@ -60,16 +61,16 @@ def test_csv_storage():
     )
     
     print(f"\nSaving test marketing call: {test_data.call_id}")
-    success = csv_storage.save_marketing_call(test_data)
+    success = get_csv_storage().save_marketing_call(test_data)
     
     if success:
-        print(f"✓ Data saved successfully to: {csv_storage.marketing_file}")
+        print(f"✓ Data saved successfully to: {get_csv_storage().marketing_file}")
     else:
         print("✗ Failed to save data")
     
     # Get statistics
     print("\nRetrieving statistics...")
-    stats = csv_storage.get_marketing_stats()
+    stats = get_csv_storage().get_marketing_stats()
     print(f"Total calls: {stats.get('total_calls', 0)}")
     print(f"Interest breakdown: {stats.get('interest_breakdown', {})}")
     
@@ -95,9 +96,11 @@ def test_multiple_campaigns():
         }
     ]
     
+    now = datetime.utcnow()
     for campaign in campaigns:
         print(f"\nCampaign: {campaign['campaign_name']}")
         
+        records = []
         for i, response in enumerate(campaign['responses'], 1):
             interest = extract_user_interest(response)
             
@@ -107,21 +110,24 @@ def test_multiple_campaigns():
                 campaign_name=campaign['campaign_name'],
                 user_interest=interest,
                 language="en-IN",
-                call_started_at=datetime.utcnow(),
-                call_ended_at=datetime.utcnow(),
+                call_started_at=now,
+                call_ended_at=now,
                 call_duration_seconds=30 + i*10,
                 segment="test",
                 objective="product_promotion",
                 call_status="completed"
             )
             
-            csv_storage.save_marketing_call(data)
+            records.append(data)
             print(f"  Call {i}: '{response}' → {interest}")
+        
+        # One batched append per campaign
+        get_csv_storage().save_marketing_calls(records)
     
     # Get campaign-specific stats
     for campaign in campaigns:
         print(f"\nStats for {campaign['campaign_name']}:")
-        stats = csv_storage.get_marketing_stats(campaign['campaign_id'])
+        stats = get_csv_storage().get_marketing_stats(campaign['campaign_id'])
         print(f"  Total calls: {stats.get('total_calls', 0)}")
         print(f"  Yes rate: {stats.get('yes_rate', 0):.1f}%")
         print(f"  No rate: {stats.get('no_rate', 0):.1f}%")
@@ -142,7 +148,7 @@ def main():
         
         print("\n" + "="*60)
         print("All data capture tests completed!")
-        print(f"Data files location: {csv_storage.data_dir}")
+        print(f"Data files location: {get_csv_storage().data_dir}")
         print("="*60 + "\n")
         
     except Exception as e:
@@ -3,7 +3,7 @@
 import logging
 from datetime import datetime, date
 from app.storage.metrics import CallMetrics, calculate_call_metrics, hash_phone_number
-from app.storage.metrics_storage import metrics_storage
+from app.storage.metrics_storage import get_metrics_storage
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -75,15 +75,16 @@ def test_metrics_storage():
     print("Testing Metrics Storage")
     print("="*60)
     
-    # Create test metrics
+    # Create test metrics (one timestamp snapshot for all rows)
+    now = datetime.utcnow()
     test_metrics = [
         CallMetrics(
             call_id=f"TEST-{i}",
             direction="inbound" if i % 2 == 0 else "outbound",
             call_type="customer_service" if i % 3 == 0 else "marketing",
-            call_started_at=datetime.utcnow(),
-            call_answered_at=datetime.utcnow(),
-            call_ended_at=datetime.utcnow(),
+            call_started_at=now,
+            call_answered_at=now,
+            call_ended_at=now,
             ring_duration=5,
             talk_duration=120 + i*10,
             total_duration=125 + i*10,
@@ -98,11 +99,11 @@ def test_metrics_storage():
     
     print(f"\nSaving {len(test_metrics)} test metrics...")
     for metrics in test_metrics:
-        success = metrics_storage.save_call_metrics(metrics)
+        success = get_metrics_storage().save_call_metrics(metrics)
         status = "✓" if success else "✗"
         print(f"{status} Saved: {metrics.call_id}")
     
-    print(f"\nMetrics file: {metrics_storage.metrics_file}")
+    print(f"\nMetrics file: {get_metrics_storage().metrics_file}")
     
     print("\n" + "="*60)
 
@@ -114,7 +115,7 @@ def test_daily_summary():
     print("="*60)
     
     # Get today's summary
-    summary = metrics_storage.get_daily_summary()
+    summary = get_metrics_storage().get_daily_summary()
     
     print(f"\nDate: {summary.date}")
     print(f"Total Calls: {summary.total_calls}")
@@ -128,8 +129,8 @@ def test_daily_summary():
     
     # Save summary
     if summary.total_calls > 0:
-        metrics_storage.save_daily_summary(summary)
-        print(f"\n✓ Daily summary saved to: {metrics_storage.daily_summary_file}")
+        get_metrics_storage().save_daily_summary(summary)
+        print(f"\n✓ Daily summary saved to: {get_metrics_storage().daily_summary_file}")
     
     print("\n" + "="*60)
 
@@ -140,7 +141,7 @@ def test_metrics_overview():
     print("Testing Metrics Overview")
     print("="*60)
     
-    overview = metrics_storage.get_metrics_overview()
+    overview = get_metrics_storage().get_metrics_overview()
     
     print(f"\nTotal Calls: {overview.get('total_calls', 0)}")
     print(f"Completed Calls: {overview.get('completed_calls', 0)}")
@@ -167,7 +168,7 @@ def main():
         
         print("\n" + "="*60)
         print("All metrics tests completed!")
-        print(f"Data location: {metrics_storage.data_dir}")
+        print(f"Data location: {get_metrics_storage().data_dir}")
         print("="*60 + "\n")
         
     except Exception as e:
@@ -1,11 +1,13 @@
 """Test script for Deepgram speech processing."""
 
 import asyncio
+import io
 import logging
 from app.speech.stt import DeepgramSTTSimple
-from app.speech.tts import DeepgramTTS, TTSVoiceConfig
+from app.speech.tts import deepgram_tts
 from app.speech.processor import SpeechProcessor
 from app.utils.audio_utils import validate_telephony_audio
+from script_utils import emit, run
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -14,9 +16,10 @@ logger = logging.getLogger(__name__)
 
 async def test_tts():
     """Test Text-to-Speech generation."""
-    print("\n" + "="*60)
-    print("Testing Deepgram TTS")
-    print("="*60)
+    out = io.StringIO()
+    print("\n" + "="*60, file=out)
+    print("Testing Deepgram TTS", file=out)
+    print("="*60, file=out)
     
     # Test cases
     test_texts = [
@@ -25,62 +28,75 @@ async def test_tts():
         "Thank you for calling. Your account balance is Rupees 50,000. Goodbye.",
     ]
     
-    tts = DeepgramTTS(voice=TTSVoiceConfig.ENGLISH_NEUTRAL)
+    # Shared global client (ENGLISH_NEUTRAL) - the same one SpeechProcessor
+    # uses, so both tests reuse one Deepgram client. Independent requests -
+    # synthesize all texts concurrently
+    results = await asyncio.gather(
+        *(deepgram_tts.synthesize(text, cache=True) for text in test_texts),
+        return_exceptions=True
+    )
     
-    for i, text in enumerate(test_texts, 1):
-        print(f"\nTest {i}: Generating TTS for: '{text}'")
+    for i, (text, audio_path) in enumerate(zip(test_texts, results), 1):
+        print(f"\nTest {i}: Generating TTS for: '{text}'", file=out)
         
         try:
-            audio_path = await tts.synthesize(text, cache=True)
+            if isinstance(audio_path, Exception):
+                raise audio_path
             
             if audio_path:
-                print(f"✓ Success! Audio saved to: {audio_path}")
+                print(f"✓ Success! Audio saved to: {audio_path}", file=out)
                 
                 # Validate audio
                 with open(audio_path, 'rb') as f:
                     audio_data = f.read()
                     if validate_telephony_audio(audio_data):
-                        print(f"✓ Audio validated for telephony")
+                        print(f"✓ Audio validated for telephony", file=out)
                     else:
-                        print(f"✗ Audio validation failed")
+                        print(f"✗ Audio validation failed", file=out)
             else:
-                print(f"✗ Failed to generate audio")
+                print(f"✗ Failed to generate audio", file=out)
                 
         except Exception as e:
-            print(f"✗ Error: {str(e)}")
+            print(f"✗ Error: {str(e)}", file=out)
     
-    print("\n" + "="*60)
+    print("\n" + "="*60, file=out)
+    
+    emit(out)
 
 
 async def test_stt():
     """Test Speech-to-Text transcription."""
-    print("\n" + "="*60)
-    print("Testing Deepgram STT")
-    print("="*60)
+    out = io.StringIO()
+    print("\n" + "="*60, file=out)
+    print("Testing Deepgram STT", file=out)
+    print("="*60, file=out)
     
     # Note: This requires a valid audio URL
     # For testing, you would need to provide an actual audio file URL
-    print("\nSTT Test: Requires valid audio URL")
-    print("Skipping automated test - STT will be tested with real calls")
+    print("\nSTT Test: Requires valid audio URL", file=out)
+    print("Skipping automated test - STT will be tested with real calls", file=out)
     
     # Example usage (commented out):
     # stt = DeepgramSTTSimple(language="en-IN")
     # transcript = await stt.transcribe_url("https://example.com/audio.wav")
     # print(f"Transcript: {transcript}")
     
-    print("\n" + "="*60)
+    print("\n" + "="*60, file=out)
+    
+    emit(out)
 
 
 async def test_speech_processor():
     """Test speech processor abstraction."""
-    print("\n" + "="*60)
-    print("Testing Speech Processor")
-    print("="*60)
+    out = io.StringIO()
+    print("\n" + "="*60, file=out)
+    print("Testing Speech Processor", file=out)
+    print("="*60, file=out)
     
     # Test TTS generation through processor
     test_text = "This is a test of the speech processor abstraction layer."
     
-    print(f"\nGenerating speech: '{test_text}'")
+    print(f"\nGenerating speech: '{test_text}'", file=out)
     
     try:
         audio_path = await SpeechProcessor.generate_speech(
@@ -90,15 +106,15 @@ async def test_speech_processor():
         )
         
         if audio_path:
-            print(f"✓ Success! Audio path: {audio_path}")
+            print(f"✓ Success! Audio path: {audio_path}", file=out)
         else:
-            print(f"✗ Failed to generate speech")
+            print(f"✗ Failed to generate speech", file=out)
             
     except Exception as e:
-        print(f"✗ Error: {str(e)}")
+        print(f"✗ Error: {str(e)}", file=out)
     
     # Test text sanitization
-    print("\nTesting text sanitization:")
+    print("\nTesting text sanitization:", file=out)
     test_cases = [
         ("Your OTP is 123456", "Your O T P is 123456"),
         ("Pay Rs. 500 via UPI", "Pay Rupees 500 via U P I"),
@@ -108,9 +124,11 @@ async def test_speech_processor():
     for original, expected in test_cases:
         sanitized = SpeechProcessor._sanitize_text_for_tts(original)
         status = "✓" if sanitized == expected else "✗"
-        print(f"{status} '{original}' → '{sanitized}'")
+        print(f"{status} '{original}' → '{sanitized}'", file=out)
     
-    print("\n" + "="*60)
+    print("\n" + "="*60, file=out)
+    
+    emit(out)
 
 
 async def main():
@@ -120,9 +138,16 @@ async def main():
     print("="*60)
     
     try:
-        await test_tts()
-        await test_stt()
-        await test_speech_processor()
+        # Independent tests (no shared state) run concurrently
+        results = await asyncio.gather(
+            test_tts(),
+            test_stt(),
+            test_speech_processor(),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Test failed: {str(result)}", exc_info=result)
         
         print("\n" + "="*60)
         print("All tests completed!")
@@ -133,4 +158,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())